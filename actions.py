@@ -0,0 +1,108 @@
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ActionResult:
+    """
+    Outcome of one action: how long it queued and spawned, and how it ended.
+
+    ``source`` is the tag the batch was submitted with (e.g. "claps",
+    "control"), so callers can tell clap sessions from manual triggers;
+    ``decision_ms`` is how long before submission the triggering sound
+    happened, as given by the caller.
+    """
+
+    def __init__(self, action, source=None, decision_ms=0.0):
+        self.action = action
+        self.source = source
+        self.decision_ms = decision_ms
+        self.ok = False
+        self.queued_ms = 0.0
+        self.spawn_ms = 0.0
+        self.returncode = None
+        self.timed_out = False
+        self.error = None
+
+    @property
+    def label(self):
+        return self.action.get("type_msg") or self.action.get("command")
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"failed ({self.error})"
+        return f"<ActionResult {self.label!r} {status} spawn={self.spawn_ms:.1f}ms>"
+
+
+class ActionExecutor:
+    """
+    Runs configured commands on a warm worker pool, off the audio thread.
+
+    ``submit`` only enqueues and returns, so the capture loop goes straight
+    back to listening. Every action in a batch is spawned concurrently.
+
+    Action dicts use the config format ({"command", "args", "type_msg"}) plus
+    an optional "timeout": when set, the worker waits that many seconds for
+    the command to exit and terminates it if it has not.
+    """
+
+    def __init__(self, workers=4, on_result=None):
+        self.workers = workers
+        self.on_result = on_result
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="action")
+        self._warm()
+
+    def _warm(self):
+        # Start every worker thread now so the first clap does not pay for
+        # thread creation.
+        barrier = threading.Barrier(self.workers + 1)
+        for _ in range(self.workers):
+            self._pool.submit(barrier.wait)
+        barrier.wait()
+
+    def submit(self, actions, source=None, decision_ms=0.0):
+        """
+        Queue a batch of actions to run concurrently.
+
+        Args:
+            actions (list): Action dicts.
+            source (str): Origin of the batch, copied to every ActionResult.
+            decision_ms (float): Time from the triggering sound to this call.
+
+        Returns:
+            list: One concurrent.futures.Future per action, resolving to an
+            ActionResult.
+        """
+        requested_at = time.perf_counter()
+        return [self._pool.submit(self._run, action, requested_at, source, decision_ms) for action in actions]
+
+    def _run(self, action, requested_at, source=None, decision_ms=0.0):
+        result = ActionResult(action, source, decision_ms)
+        started = time.perf_counter()
+        result.queued_ms = (started - requested_at) * 1000.0
+        try:
+            full_command = [action.get("command")] + list(action.get("args", []))
+            proc = subprocess.Popen(full_command)
+            result.spawn_ms = (time.perf_counter() - started) * 1000.0
+            result.ok = True
+            timeout = action.get("timeout")
+            if timeout:
+                try:
+                    result.returncode = proc.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    result.timed_out = True
+                    result.ok = False
+                    result.error = f"timed out after {timeout}s"
+                    proc.terminate()
+        except Exception as e:
+            result.spawn_ms = (time.perf_counter() - started) * 1000.0
+            result.error = str(e)
+        if self.on_result:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                print(f"[ERROR] Action result callback failed: {e}")
+        return result
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait)
@@ -1,6 +1,11 @@
 import subprocess
 import os
+import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from process_table import default_table
 
 def app_is_running(app_name):
     """
@@ -12,13 +17,22 @@ def app_is_running(app_name):
     Returns:
         bool: True if running, False otherwise.
     """
-    try:
-        # pgrep -x matches exact process name
-        # Note: Some apps might have different process names than their display names.
-        subprocess.check_call(["pgrep", "-x", app_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
-    except subprocess.CalledProcessError:
-        return False
+    # Exact process-name match (like pgrep -x), answered from a cached
+    # process-table snapshot instead of spawning pgrep per query.
+    # Note: Some apps might have different process names than their display names.
+    return default_table.is_running(app_name)
+
+def apps_running(app_names):
+    """
+    Check several applications against a single process-table snapshot.
+    
+    Args:
+        app_names (list): Names of the applications to check.
+        
+    Returns:
+        dict: Application name -> True if running, False otherwise.
+    """
+    return default_table.running(app_names)
 
 def launch_app(app_name, wait=0.5):
     """
@@ -34,6 +48,7 @@ def launch_app(app_name, wait=0.5):
     try:
         print(f"Launching {app_name}...")
         subprocess.Popen(["open", "-a", app_name])
+        default_table.invalidate()
         if wait > 0:
             time.sleep(wait)
         return True
@@ -62,6 +77,7 @@ def launch_app_with_path(app_name, folder_path):
             
         print(f"Opening '{abs_path}' with {app_name}...")
         subprocess.Popen(["open", "-a", app_name, abs_path])
+        default_table.invalidate()
         return True
     except Exception as e:
         print(f"Error launching {app_name} with path {folder_path}: {e}")
@@ -91,39 +107,224 @@ def open_url_in_browser(url, browser="Google Chrome", new_window=True):
             cmd = ["open", "-a", browser, url]
             
         subprocess.Popen(cmd)
+        default_table.invalidate()
         return True
     except Exception as e:
         print(f"Error opening URL in {browser}: {e}")
         return False
 
+def process_ready(app_name):
+    """
+    Readiness check: the application's process is running.
+
+    Args:
+        app_name (str): Process name as matched by app_is_running.
+
+    Returns:
+        callable: A no-argument check returning True once ready.
+    """
+    # Polled every few tens of milliseconds, so accept only a fresh snapshot;
+    # concurrent waiters still share one scan per poll interval.
+    return lambda: default_table.is_running(app_name, max_age=0.05)
+
+def port_ready(port, host="127.0.0.1"):
+    """
+    Readiness check: something is accepting TCP connections on a port.
+
+    Args:
+        port (int): TCP port to probe.
+        host (str): Host to connect to. Default is localhost.
+
+    Returns:
+        callable: A no-argument check returning True once ready.
+    """
+    def check():
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+    return check
+
+def file_ready(path):
+    """
+    Readiness check: a file (socket, lock file, log...) exists.
+
+    Args:
+        path (str): Path to wait for. ~ is expanded.
+
+    Returns:
+        callable: A no-argument check returning True once ready.
+    """
+    abs_path = os.path.abspath(os.path.expanduser(path))
+    return lambda: os.path.exists(abs_path)
+
+def wait_until(check, timeout=30.0, interval=0.05):
+    """
+    Poll a readiness check until it passes or the timeout expires.
+
+    Args:
+        check (callable): No-argument function returning True when ready.
+        timeout (float): Maximum seconds to wait.
+        interval (float): Seconds between polls.
+
+    Returns:
+        bool: True if the check passed in time, False otherwise.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if check():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+def _launch_item(item):
+    """Start one workspace item: an app name, (app, path) tuple or {"url": ...} dict."""
+    if isinstance(item, str):
+        return launch_app(item, wait=0)
+    if isinstance(item, tuple) and len(item) == 2:
+        return launch_app_with_path(item[0], item[1])
+    if isinstance(item, dict) and "url" in item:
+        return open_url_in_browser(item["url"], item.get("browser", "Google Chrome"),
+                                   item.get("new_window", True))
+    print(f"Error: Unknown launch item: {item!r}")
+    return False
+
+def _check_acyclic(steps):
+    """Raise ValueError if the "after" relations contain a cycle."""
+    state = {}
+
+    def visit(name, chain):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+        state[name] = "visiting"
+        for dep in steps[name].get("after", []):
+            visit(dep, chain + [name])
+        state[name] = "done"
+
+    for name in steps:
+        visit(name, [])
+
+def launch_workspace(steps, timeout=30.0):
+    """
+    Launch a workspace described as a dependency graph.
+
+    Independent steps start in parallel. A step with dependencies starts as
+    soon as every step it depends on is *ready*, according to that step's
+    readiness check (process_ready, port_ready, file_ready or any callable),
+    instead of after a fixed sleep.
+
+    Args:
+        steps (dict): Step name -> {
+                "launch": app name, (app_name, path) tuple or {"url": ...},
+                "after": list of step names this step waits for (optional),
+                "ready": readiness check callable (optional; without one the
+                         step counts as ready as soon as it has launched),
+            }
+        timeout (float): Maximum seconds to wait for any single readiness check.
+
+    Returns:
+        dict: {
+            "launched": number of steps that launched and became ready,
+            "failed": {step name: reason},
+            "timings": {step name: {"start": s, "ready": s}} relative to launch,
+            "critical_path": step names on the longest dependency chain,
+            "critical_path_seconds": ready time of the last step on that chain,
+        }
+    """
+    for name, step in steps.items():
+        if "launch" not in step:
+            raise ValueError(f"Step '{name}' has no 'launch' entry")
+        for dep in step.get("after", []):
+            if dep not in steps:
+                raise ValueError(f"Step '{name}' depends on unknown step '{dep}'")
+    _check_acyclic(steps)
+
+    t0 = time.monotonic()
+    ready_events = {name: threading.Event() for name in steps}
+    timings = {}
+    failed = {}
+    lock = threading.Lock()
+
+    def run_step(name):
+        step = steps[name]
+        try:
+            for dep in step.get("after", []):
+                ready_events[dep].wait()
+                with lock:
+                    if dep in failed:
+                        failed[name] = f"dependency '{dep}' not ready"
+                        return
+            start = time.monotonic() - t0
+            ok = _launch_item(step["launch"])
+            if ok and step.get("ready"):
+                ok = wait_until(step["ready"], timeout=timeout)
+                reason = f"not ready after {timeout}s"
+            else:
+                reason = "launch failed"
+            with lock:
+                timings[name] = {"start": start, "ready": time.monotonic() - t0}
+                if not ok:
+                    failed[name] = reason
+        except Exception as e:
+            print(f"[ERROR] Workspace step '{name}' failed: {e}")
+            with lock:
+                failed[name] = f"error: {e}"
+        finally:
+            # Dependents wait on this event; it must be set on every path.
+            ready_events[name].set()
+
+    print(f"Starting workspace launch for {len(steps)} steps...")
+    # Every step needs its own worker while it waits on dependencies, so the
+    # pool must be able to hold all of them at once.
+    with ThreadPoolExecutor(max_workers=max(1, len(steps))) as pool:
+        for name in steps:
+            pool.submit(run_step, name)
+
+    # Walk back from the step that became ready last, always following the
+    # dependency that was ready latest: that chain bounded the total time.
+    critical_path = []
+    if timings:
+        current = max(timings, key=lambda n: timings[n]["ready"])
+        while current:
+            critical_path.insert(0, current)
+            deps = [d for d in steps[current].get("after", []) if d in timings]
+            current = max(deps, key=lambda d: timings[d]["ready"]) if deps else None
+    critical_seconds = timings[critical_path[-1]]["ready"] if critical_path else 0.0
+
+    launched = len(steps) - len(failed)
+    print(f"Workspace launch complete. {launched}/{len(steps)} ready; "
+          f"critical path {' -> '.join(critical_path)} took {critical_seconds:.2f}s.")
+    return {
+        "launched": launched,
+        "failed": failed,
+        "timings": timings,
+        "critical_path": critical_path,
+        "critical_path_seconds": critical_seconds,
+    }
+
 def launch_multiple_apps(app_list, delay=0.5):
     """
-    Launch multiple applications sequentially.
+    Launch multiple applications in parallel.
     
     Args:
         app_list (list): List of strings (app names) or tuples (app_name, path).
-        delay (float): Delay in seconds between launches.
+        delay (float): Unused; launches no longer sleep between apps. Kept
+            for compatibility. Use launch_workspace for ordered launches.
         
     Returns:
         int: Count of successfully launched apps.
     """
-    count = 0
-    print(f"Starting launch sequence for {len(app_list)} apps...")
-    
-    for item in app_list:
-        success = False
-        if isinstance(item, str):
-            success = launch_app(item, wait=delay)
-        elif isinstance(item, tuple) and len(item) == 2:
-            success = launch_app_with_path(item[0], item[1])
-            if success and delay > 0:
-                time.sleep(delay)
-        
-        if success:
-            count += 1
-            
-    print(f"Launch sequence complete. Launched {count}/{len(app_list)} apps.")
-    return count
+    steps = {f"{i}:{item if isinstance(item, str) else item[0]}": {"launch": item}
+             for i, item in enumerate(app_list)}
+    report = launch_workspace(steps)
+    return report["launched"]
 
 def close_app(app_name):
     """
@@ -144,6 +345,7 @@ def close_app(app_name):
         # specific osascript command to quit app gracefully
         cmd = ["osascript", "-e", f'quit app "{app_name}"']
         subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        default_table.invalidate()
         print(f"{app_name} closed successfully.")
         return True
     except subprocess.CalledProcessError as e:
@@ -162,6 +364,7 @@ if __name__ == "__main__":
     # 1. Check if an app is running
     is_running = app_is_running("Calculator")
     print(f"Is Calculator running? {is_running}")
+    print(apps_running(["Calculator", "Finder", "Dock"]))
     
     # 2. Launch single app
     # launch_app("Calculator")
@@ -179,7 +382,14 @@ if __name__ == "__main__":
     #     "Terminal"
     # ]
     # launch_multiple_apps(my_apps)
+
+    # 6. Launch a workspace with dependencies
+    # launch_workspace({
+    #     "docker": {"launch": "Docker", "ready": file_ready("~/.docker/run/docker.sock")},
+    #     "editor": {"launch": ("Visual Studio Code", "~/Downloads")},
+    #     "dashboard": {"launch": {"url": "http://localhost:3000"}, "after": ["docker"]},
+    # })
     
-    # 6. Close app (uncomment to test - will close Calculator if running)
+    # 7. Close app (uncomment to test - will close Calculator if running)
     # time.sleep(2)
     # close_app("Calculator")
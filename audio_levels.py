@@ -0,0 +1,181 @@
+import math
+
+import numpy as np
+
+# Full scale for signed 16-bit PCM.
+FULL_SCALE = 32768.0
+
+# Floor used for dBFS of digital silence so callers never see -inf.
+SILENCE_DBFS = -96.0
+
+
+def as_int16(data):
+    """
+    View raw int16 PCM bytes (or an existing sample array) as a NumPy array.
+
+    Bytes are wrapped with np.frombuffer, so no copy is made.
+    """
+    if isinstance(data, np.ndarray):
+        return data
+    return np.frombuffer(data, dtype=np.int16)
+
+
+def rms(data):
+    """
+    Root-mean-square amplitude of an int16 buffer.
+
+    Args:
+        data (bytes | np.ndarray): Raw PCM bytes or int16 samples.
+
+    Returns:
+        float: RMS in sample units (0-32768). 0.0 for an empty buffer.
+    """
+    samples = as_int16(data)
+    if samples.size == 0:
+        return 0.0
+    # float64 dot product avoids int16 overflow and a temporary squares array.
+    x = samples.astype(np.float64)
+    return float(np.sqrt(np.dot(x, x) / x.size))
+
+
+def peak(data):
+    """
+    Absolute peak amplitude of an int16 buffer, in sample units.
+    """
+    samples = as_int16(data)
+    if samples.size == 0:
+        return 0
+    # Widen before abs() so -32768 does not wrap.
+    return int(max(int(samples.max()), -int(samples.min())))
+
+
+def dbfs(value):
+    """
+    Convert an amplitude in sample units (RMS or peak) to dBFS.
+    """
+    if value <= 0:
+        return SILENCE_DBFS
+    return max(float(20.0 * np.log10(value / FULL_SCALE)), SILENCE_DBFS)
+
+
+def analyze(data):
+    """
+    Compute every level metric for a buffer.
+
+    Returns:
+        dict: rms, peak, rms_dbfs and peak_dbfs.
+    """
+    samples = as_int16(data)
+    level_rms = rms(samples)
+    level_peak = peak(samples)
+    return {
+        "rms": level_rms,
+        "peak": level_peak,
+        "rms_dbfs": dbfs(level_rms),
+        "peak_dbfs": dbfs(level_peak),
+    }
+
+
+def normalized_level(level_rms, full_scale=5000.0):
+    """
+    Map an RMS value onto the 0.0-1.0 range used by the HUD orb.
+    """
+    return min(level_rms / full_scale, 1.0)
+
+
+class LevelMeter:
+    """
+    Decimate a per-frame level feed to a display rate, with peak hold.
+
+    Frames arrive ~31 times a second; the HUD only needs a handful of
+    updates. Between updates the loudest level is held, so a short clap
+    still shows up even if it falls between two display ticks. Timing uses
+    stream sample positions, not wall time.
+    """
+
+    def __init__(self, sample_rate, display_rate=15.0):
+        self.interval = max(1, int(sample_rate / display_rate))
+        self.enabled = True
+        self._peak = 0.0
+        self._last = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._peak = 0.0
+        self._last = None
+
+    def update(self, level, position):
+        """
+        Add the level of the frame ending at ``position``.
+
+        Returns:
+            float | None: The held peak when a display update is due, else None.
+        """
+        if level > self._peak:
+            self._peak = level
+        if self._last is not None and position - self._last < self.interval:
+            return None
+        held, self._peak, self._last = self._peak, 0.0, position
+        return held
+
+
+class NoiseFloor:
+    """
+    Streaming noise-floor and dynamic-range estimate that derives a clap
+    threshold, O(1) per frame.
+
+    Frame RMS is tracked in dB by two asymmetric EWMAs. The floor falls
+    quickly (``fall_seconds``) and rises slowly (``rise_seconds``), so it
+    follows drifting ambient noise but barely moves for claps or speech.
+    A loud-level tracker does the opposite: it jumps up to any louder frame
+    and decays by ``peak_decay_db`` per second. The clap threshold sits
+    ``margin_db`` above the floor, never below ``min_threshold``.
+    """
+
+    def __init__(self, sample_rate, margin_db=20.0, min_threshold=300.0,
+                 fall_seconds=0.5, rise_seconds=10.0, peak_decay_db=1.0):
+        self.sample_rate = sample_rate
+        self.margin_db = margin_db
+        self.min_threshold = min_threshold
+        self.fall_seconds = fall_seconds
+        self.rise_seconds = rise_seconds
+        self.peak_decay_db = peak_decay_db
+        self.reset()
+
+    def reset(self):
+        self.floor_dbfs = None
+        self.loud_dbfs = None
+
+    def update(self, level_rms, n_samples):
+        """Add the RMS of a frame of ``n_samples`` samples."""
+        level = dbfs(level_rms)
+        if self.floor_dbfs is None:
+            self.floor_dbfs = self.loud_dbfs = level
+            return
+        seconds = n_samples / self.sample_rate
+        tau = self.fall_seconds if level < self.floor_dbfs else self.rise_seconds
+        self.floor_dbfs += (1.0 - math.exp(-seconds / tau)) * (level - self.floor_dbfs)
+        self.loud_dbfs = max(level, self.loud_dbfs - self.peak_decay_db * seconds, self.floor_dbfs)
+
+    @property
+    def range_db(self):
+        if self.floor_dbfs is None:
+            return 0.0
+        return self.loud_dbfs - self.floor_dbfs
+
+    @property
+    def threshold(self):
+        """Clap threshold in sample units (RMS of a 1 ms hop)."""
+        if self.floor_dbfs is None:
+            return float(self.min_threshold)
+        level = FULL_SCALE * 10.0 ** ((self.floor_dbfs + self.margin_db) / 20.0)
+        return float(min(max(level, self.min_threshold), FULL_SCALE - 1))
+
+    def state(self):
+        """Current estimate for display: floor/loud dBFS, range dB, threshold."""
+        return {
+            "floor_dbfs": SILENCE_DBFS if self.floor_dbfs is None else float(self.floor_dbfs),
+            "loud_dbfs": SILENCE_DBFS if self.loud_dbfs is None else float(self.loud_dbfs),
+            "range_db": float(self.range_db),
+            "threshold": self.threshold,
+        }
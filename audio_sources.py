@@ -0,0 +1,330 @@
+"""
+Audio sources feeding the detection pipeline.
+
+Every source yields mono int16 sample blocks through the same interface
+(open / read(n) / close), whether audio comes from the microphone, a
+recording on disk, or a generator. Only live sources are throttled to
+real time; file and synthetic sources return data as fast as it is read.
+"""
+import contextlib
+import os
+import sys
+import wave
+
+import numpy as np
+
+from capture import BlockQueue
+
+
+@contextlib.contextmanager
+def ignore_stderr():
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    old_stderr = os.dup(2)
+    sys.stderr.flush()
+    os.dup2(devnull, 2)
+    os.close(devnull)
+    try:
+        yield
+    finally:
+        os.dup2(old_stderr, 2)
+        os.close(old_stderr)
+
+
+def input_devices():
+    """(index, name) of every input device PortAudio reports."""
+    import pyaudio
+
+    with ignore_stderr():
+        pa = pyaudio.PyAudio()
+        try:
+            infos = [pa.get_device_info_by_index(i) for i in range(pa.get_device_count())]
+        finally:
+            pa.terminate()
+    return [(info["index"], info["name"]) for info in infos if info.get("maxInputChannels", 0) > 0]
+
+
+def find_input_device(spec):
+    """
+    Resolve an INPUT_DEVICES entry to an input device.
+
+    Args:
+        spec (int | str): A PortAudio device index, or part of a device
+            name (case-insensitive).
+
+    Returns:
+        tuple: (index, name).
+
+    Raises:
+        ValueError: If no input device matches, or a name matches several.
+    """
+    devices = input_devices()
+    if isinstance(spec, int):
+        for index, name in devices:
+            if index == spec:
+                return index, name
+        raise ValueError(f"no input device with index {spec}")
+    matches = [(index, name) for index, name in devices if spec.lower() in name.lower()]
+    if len(matches) != 1:
+        found = ", ".join(name for _, name in matches) or "none"
+        raise ValueError(f"'{spec}' must match exactly one input device (matched: {found})")
+    return matches[0]
+
+
+class AudioSource:
+    """Base class for mono 16-bit PCM sources."""
+
+    realtime = False
+
+    def __init__(self, sample_rate, frames_per_buffer):
+        self.sample_rate = sample_rate
+        self.frames_per_buffer = frames_per_buffer
+
+    def open(self):
+        pass
+
+    def read(self, n):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PyAudioSource(AudioSource):
+    """
+    The default (or a chosen) input device via PortAudio.
+
+    In callback mode PortAudio delivers each buffer on its own thread and the
+    callback only copies it into a preallocated BlockQueue, so a slow
+    consumer can never block the device. Lost audio is counted: ``overflows``
+    for input overflows reported by PortAudio, ``dropped`` for buffers that
+    arrived while the queue was full.
+    """
+
+    realtime = True
+
+    def __init__(self, sample_rate, frames_per_buffer, device_index=None,
+                 callback=True, queue_blocks=32):
+        super().__init__(sample_rate, frames_per_buffer)
+        self.device_index = device_index
+        self.callback = callback
+        self.queue = BlockQueue(queue_blocks, frames_per_buffer) if callback else None
+        self.overflows = 0
+        self.pa = None
+        self._stream = None
+        self._pyaudio = None
+
+    @property
+    def dropped(self):
+        return self.queue.dropped if self.queue else 0
+
+    def _on_audio(self, in_data, frame_count, time_info, status_flags):
+        if status_flags & self._pyaudio.paInputOverflow:
+            self.overflows += 1
+        self.queue.put(np.frombuffer(in_data, dtype=np.int16))
+        return (None, self._pyaudio.paContinue)
+
+    def open(self):
+        # Imported here so file and synthetic sources work on machines
+        # without PortAudio (e.g. headless CI).
+        import pyaudio
+
+        self._pyaudio = pyaudio
+        if self.queue:
+            self.queue.clear()
+        with ignore_stderr():
+            self.pa = pyaudio.PyAudio()
+            try:
+                self._stream = self.pa.open(
+                    rate=self.sample_rate,
+                    channels=1,
+                    format=pyaudio.paInt16,
+                    input=True,
+                    input_device_index=self.device_index,
+                    frames_per_buffer=self.frames_per_buffer,
+                    stream_callback=self._on_audio if self.callback else None
+                )
+            except Exception:
+                self.pa.terminate()
+                self.pa = None
+                raise
+
+    def read(self, n):
+        if self.callback:
+            # Blocks come in frames_per_buffer units, which is what the
+            # capture thread asks for.
+            block = self.queue.get(timeout=0.5)
+            if block is None:
+                raise TimeoutError("no audio from input device")
+            return block
+        data = self._stream.read(n, exception_on_overflow=False)
+        return np.frombuffer(data, dtype=np.int16)
+
+    def close(self):
+        # Terminating PortAudio (not just closing the stream) is what turns
+        # off the macOS microphone indicator.
+        with ignore_stderr():
+            if self._stream:
+                try:
+                    self._stream.stop_stream()
+                    self._stream.close()
+                except Exception:
+                    pass
+                self._stream = None
+            if self.pa:
+                self.pa.terminate()
+                self.pa = None
+
+
+class FileSource(AudioSource):
+    """
+    A WAV file or headerless raw PCM (int16 little-endian) recording.
+
+    Reads are unthrottled. Multi-channel WAV files are mixed down to mono.
+    """
+
+    def __init__(self, path, sample_rate=16000, frames_per_buffer=512, raw=None):
+        super().__init__(sample_rate, frames_per_buffer)
+        self.path = path
+        self.raw = raw if raw is not None else not path.lower().endswith(".wav")
+        self.channels = 1
+        self._wav = None
+        self._raw_file = None
+
+    def open(self):
+        if self.raw:
+            self._raw_file = open(self.path, "rb")
+            return
+        self._wav = wave.open(self.path, "rb")
+        if self._wav.getsampwidth() != 2:
+            self._wav.close()
+            raise ValueError(f"{self.path}: only 16-bit PCM WAV is supported")
+        if self._wav.getframerate() != self.sample_rate:
+            rate = self._wav.getframerate()
+            self._wav.close()
+            raise ValueError(f"{self.path}: sample rate {rate} Hz, expected {self.sample_rate} Hz")
+        self.channels = self._wav.getnchannels()
+
+    def read(self, n):
+        if self.raw:
+            data = self._raw_file.read(n * 2)
+        else:
+            data = self._wav.readframes(n)
+        if not data:
+            return None
+        samples = np.frombuffer(data[:len(data) - len(data) % (2 * self.channels)], dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1).astype(np.int16)
+        return samples
+
+    def close(self):
+        if self._wav:
+            self._wav.close()
+            self._wav = None
+        if self._raw_file:
+            self._raw_file.close()
+            self._raw_file = None
+
+
+class SyntheticSource(AudioSource):
+    """
+    Deterministic generated audio: a noise floor, optional tone and clap bursts.
+
+    Args:
+        duration (float): Total length in seconds, or None for endless audio.
+        noise_rms (float): RMS of the white-noise floor, in sample units.
+        claps (list): Clap onset times in seconds.
+        clap_amplitude (int): Peak amplitude of each clap burst.
+        tone_hz (float): Optional sine tone frequency mixed into the floor.
+        seed (int): Random seed, so every run produces identical samples.
+    """
+
+    CLAP_DECAY_SECONDS = 0.008
+    CLAP_LENGTH_SECONDS = 0.05
+
+    def __init__(self, sample_rate=16000, frames_per_buffer=512, duration=10.0,
+                 noise_rms=100.0, claps=(), clap_amplitude=20000, tone_hz=None,
+                 tone_amplitude=1000, seed=0):
+        super().__init__(sample_rate, frames_per_buffer)
+        self.duration = duration
+        self.noise_rms = noise_rms
+        self.claps = sorted(claps)
+        self.clap_amplitude = clap_amplitude
+        self.tone_hz = tone_hz
+        self.tone_amplitude = tone_amplitude
+        self.seed = seed
+        self.position = 0
+        self._rng = None
+        self._clap_shape = None
+        self._total = None
+
+    def open(self):
+        self.position = 0
+        self._rng = np.random.default_rng(self.seed)
+        self._total = None if self.duration is None else int(self.duration * self.sample_rate)
+        length = int(self.CLAP_LENGTH_SECONDS * self.sample_rate)
+        t = np.arange(length) / self.sample_rate
+        burst = np.random.default_rng(self.seed + 1).uniform(-1.0, 1.0, length)
+        self._clap_shape = burst * np.exp(-t / self.CLAP_DECAY_SECONDS) * self.clap_amplitude
+
+    def read(self, n):
+        if self._total is not None:
+            n = min(n, self._total - self.position)
+            if n <= 0:
+                return None
+        start = self.position
+        out = self._rng.normal(0.0, self.noise_rms, n)
+        if self.tone_hz:
+            t = np.arange(start, start + n) / self.sample_rate
+            out += self.tone_amplitude * np.sin(2 * np.pi * self.tone_hz * t)
+        length = self._clap_shape.size
+        for clap_time in self.claps:
+            onset = int(clap_time * self.sample_rate)
+            lo = max(onset, start)
+            hi = min(onset + length, start + n)
+            if lo < hi:
+                out[lo - start:hi - start] += self._clap_shape[lo - onset:hi - onset]
+        self.position += n
+        return np.clip(out, -32768, 32767).astype(np.int16)
+
+
+class SourceReader:
+    """
+    Pull samples straight from a source, with the same interface as
+    capture.RingReader.
+
+    Used for offline replay, where no capture thread or ring is needed and
+    the consumer simply runs as fast as the source can deliver.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.position = 0
+        self.closed = False
+        self.overruns = 0
+        self._pending = np.zeros(0, dtype=np.int16)
+
+    def available(self):
+        return self._pending.size
+
+    def seek_to_latest(self):
+        pass
+
+    def read(self, n, timeout=None):
+        while self._pending.size < n and not self.closed:
+            block = self.source.read(max(n - self._pending.size, self.source.frames_per_buffer))
+            if block is None:
+                self.closed = True
+                break
+            self._pending = np.concatenate((self._pending, block))
+        if self._pending.size < n:
+            return None
+        data, self._pending = self._pending[:n], self._pending[n:]
+        self.position += n
+        return data
@@ -0,0 +1,82 @@
+"""
+Benchmark multi-microphone scaling: CPU per device as devices are added.
+
+Runs 1, 2, 4, ... DeviceListeners at once, each on its own thread with its
+own synthetic clip and keyword engine, and measures the CPU time every
+listener thread spends per hour of audio. With no shared per-frame state
+the cost per device should stay flat (per_device_ratio near 1.0) while
+the total grows linearly.
+
+Usage:
+    python benchmarks/bench_devices.py [--devices 1,2,4] [--seconds N] [--output results.json]
+"""
+import argparse
+import threading
+import time
+
+import common
+
+from config_store import ConfigSnapshot
+from listener import DeviceListener
+from metrics import Registry
+
+
+def run_listener(listener, source, cpu):
+    position = 0
+    started = time.thread_time()
+    with source:
+        while (pcm := source.read(common.FRAME_LENGTH)) is not None:
+            position += pcm.size
+            listener.process(pcm, position)
+    cpu[listener.name] = (time.thread_time() - started, position / common.SAMPLE_RATE)
+
+
+def bench_devices(count, seconds, access_key):
+    settings = ConfigSnapshot.from_module()
+    registry = Registry()
+    listeners, engines, cpu = [], [], {}
+    for i in range(count):
+        engine, engine_name = common.keyword_engine(access_key)
+        engines.append(engine)
+        listeners.append(DeviceListener(f"mic{i}", engine, ("jarvis",), settings, None, registry,
+                                        log=lambda message, level="INFO": None,
+                                        on_event=lambda listener, event, value: None))
+    threads = [threading.Thread(target=run_listener, args=(listener, common.synthetic_clip(seconds, seed=i), cpu))
+               for i, listener in enumerate(listeners)]
+    wall_started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_started
+    for engine in engines:
+        engine.delete()
+    per_device = [cpu_s * 3600.0 / audio_s for cpu_s, audio_s in cpu.values()]
+    return {
+        "keyword_engine": engine_name,
+        "wall_seconds": wall,
+        "cpu_seconds_per_audio_hour_total": sum(per_device),
+        "cpu_seconds_per_audio_hour_per_device": sum(per_device) / count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-device scaling benchmark.")
+    parser.add_argument("--devices", default="1,2,4", help="Comma-separated device counts")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Audio per device")
+    parser.add_argument("--access-key", help="Porcupine key; benchmarks the real engine when set")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    results = {}
+    baseline = None
+    for count in (int(n) for n in args.devices.split(",")):
+        result = bench_devices(count, args.seconds, args.access_key)
+        baseline = baseline or result["cpu_seconds_per_audio_hour_per_device"]
+        result["per_device_ratio"] = result["cpu_seconds_per_audio_hour_per_device"] / baseline
+        results[f"devices_{count}"] = result
+    common.write_results("devices", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
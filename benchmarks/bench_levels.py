@@ -0,0 +1,91 @@
+"""
+Microbenchmark: per-frame cost of the loudness calculation.
+
+Compares the original struct.unpack + pure-Python loops against the
+shared NumPy implementation in audio_levels, for both frame sizes the
+engine uses (Porcupine's 512-sample frame and the 1024-sample clap chunk).
+
+Usage:
+    python benchmarks/bench_levels.py [--iterations N] [--output results.json]
+"""
+import argparse
+import math
+import struct
+import timeit
+
+import numpy as np
+
+import common
+
+import audio_levels
+
+
+def legacy_clap_loudness(data):
+    """ClapDetector.get_loudness before audio_levels."""
+    count = len(data) // 2
+    shorts = struct.unpack(f"{count}h", data)
+    sum_squares = 0.0
+    for sample in shorts:
+        sum_squares += sample * sample
+    if count == 0: return 0
+    return (sum_squares / count) ** 0.5
+
+
+def legacy_wake_level(data):
+    """Level calculation in VoiceLauncher.run before audio_levels."""
+    count = len(data) // 2
+    pcm = struct.unpack_from("h" * count, data)
+    rms = math.sqrt(sum(x**2 for x in pcm) / len(pcm))
+    return min(rms / 5000.0, 1.0)
+
+
+def vectorized_clap_loudness(data):
+    return audio_levels.rms(data)
+
+
+def vectorized_wake_level(data):
+    return audio_levels.normalized_level(audio_levels.rms(data))
+
+
+def make_frame(samples, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(-8000, 8000, size=samples, dtype=np.int16).tobytes()
+
+
+def time_per_call(func, data, iterations):
+    total = timeit.timeit(lambda: func(data), number=iterations)
+    return total / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Also write a JSON report to this file")
+    args = parser.parse_args()
+
+    cases = [
+        ("wake loop (512 samples)", 512, legacy_wake_level, vectorized_wake_level),
+        ("clap chunk (1024 samples)", 1024, legacy_clap_loudness, vectorized_clap_loudness),
+    ]
+
+    results = {}
+    print(f"{'case':<28}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, samples, before, after in cases:
+        data = make_frame(samples)
+        # Both implementations must agree before their timings mean anything.
+        assert abs(before(data) - after(data)) < 1e-6 * max(1.0, before(data))
+        t_before = time_per_call(before, data, args.iterations)
+        t_after = time_per_call(after, data, args.iterations)
+        print(f"{name:<28}{t_before * 1e6:>14.2f}{t_after * 1e6:>14.2f}{t_before / t_after:>9.1f}x")
+        results[f"frame_{samples}"] = {
+            "before_us": t_before * 1e6,
+            "after_us": t_after * 1e6,
+            "speedup": t_before / t_after,
+        }
+
+    if args.output:
+        common.write_results("levels", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark the audio pipeline end to end on recorded or synthetic audio.
+
+Measures:
+    frame_cost           per-frame cost of DeviceListener.process (level, noise
+                         floor, keyword gate, DetectionPipeline and metrics)
+    clap_detector        ClapDetector throughput in samples/sec
+    wake_to_action       latency from the last clap sample to the action spawn
+    cpu_per_audio_hour   CPU seconds needed to process one hour of audio
+
+Usage:
+    python benchmarks/bench_pipeline.py [--wav FILE] [--seconds N] [--output results.json]
+"""
+import argparse
+import dataclasses
+import statistics
+import time
+
+import common
+
+import config
+from actions import ActionExecutor
+from config_store import ConfigSnapshot
+from listener import DeviceListener
+from metrics import Registry
+from replay import replay
+from voice_launcher import ClapDetector
+
+
+def make_listener(engine, on_event=None):
+    """A DeviceListener on config.py defaults, doing the real per-frame work."""
+    return DeviceListener("bench", engine, ("jarvis",), ConfigSnapshot.from_module(), None, Registry(),
+                          log=lambda message, level="INFO": None,
+                          on_event=on_event or (lambda listener, event, value: None))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def summarize_us(samples):
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": percentile(samples, 50) * 1e6,
+        "p99_us": percentile(samples, 99) * 1e6,
+        "max_us": max(samples) * 1e6,
+        "frames": len(samples),
+    }
+
+
+def bench_frame_cost(source, engine):
+    listener = make_listener(engine)
+    timings = []
+    position = 0
+    with source:
+        while (pcm := source.read(common.FRAME_LENGTH)) is not None:
+            position += pcm.size
+            started = time.perf_counter()
+            listener.process(pcm, position)
+            timings.append(time.perf_counter() - started)
+    result = summarize_us(timings)
+    result["keyword_skip_fraction"] = listener.keyword_gate.stats()["skip_fraction"]
+    return result
+
+
+def bench_clap_detector(source):
+    started = time.perf_counter()
+    # config.py defaults, not the user's config.json, so runs are comparable.
+    # debug_mode off: its per-session prints would be timed and mix with the JSON.
+    settings = dataclasses.replace(ConfigSnapshot.from_module(), debug_mode=False)
+    sessions, samples = replay(source, ClapDetector(settings))
+    elapsed = time.perf_counter() - started
+    return {
+        "samples": samples,
+        "seconds": elapsed,
+        "samples_per_sec": samples / elapsed,
+        "realtime_factor": samples / common.SAMPLE_RATE / elapsed,
+        "sessions": len(sessions),
+    }
+
+
+def bench_wake_to_action(seconds):
+    """
+    Arm a session before each synthetic clap group and time the decision.
+
+    decision_ms is measured on the stream clock (from the last clap sample to
+    the end of the frame that produced the decision) plus the wall time spent
+    processing that frame; spawn_ms is the time from handing the action to
+    the ActionExecutor until its Popen returned, and audio_thread_ms is how
+    long the submit call held up the audio loop.
+    """
+    groups = common.clap_groups(seconds)
+    wake_frames = [int((group[0] - 0.5) * common.SAMPLE_RATE / common.FRAME_LENGTH) for group in groups]
+    events = []
+    listener = make_listener(common.ScriptedKeywordEngine(wake_frames),
+                             on_event=lambda listener, event, value: events.append((event, value)))
+    # The scripted engine counts the frames it sees; keep it seeing all of them.
+    listener.keyword_gate.enabled = False
+    source = common.synthetic_clip(seconds)
+
+    executor = ActionExecutor(workers=2)
+    noop = {"command": "true"}
+    decision_ms, spawn_ms, end_to_end_ms, audio_thread_ms = [], [], [], []
+    pending = list(groups)
+    position = 0
+    with source:
+        while (pcm := source.read(common.FRAME_LENGTH)) is not None:
+            position += pcm.size
+            started = time.perf_counter()
+            listener.process(pcm, position)
+            frame_time = time.perf_counter() - started
+            frame_events, events[:] = list(events), []
+            for event, count in frame_events:
+                if event != "claps":
+                    continue
+                group = pending.pop(0)
+                stream_delay = (position - int(group[-1] * common.SAMPLE_RATE)) / common.SAMPLE_RATE
+                decision = (stream_delay + frame_time) * 1000.0
+                submitted = time.perf_counter()
+                futures = executor.submit([noop])
+                audio_thread_ms.append((time.perf_counter() - submitted) * 1000.0)
+                result = futures[0].result()
+                spawn = result.queued_ms + result.spawn_ms
+                decision_ms.append(decision)
+                spawn_ms.append(spawn)
+                end_to_end_ms.append(decision + spawn)
+    executor.shutdown(wait=True)
+    return {
+        "sessions": len(decision_ms),
+        "audio_thread_ms_max": max(audio_thread_ms),
+        "decision_ms_mean": statistics.fmean(decision_ms),
+        "decision_ms_max": max(decision_ms),
+        "spawn_ms_mean": statistics.fmean(spawn_ms),
+        "spawn_ms_max": max(spawn_ms),
+        "end_to_end_ms_mean": statistics.fmean(end_to_end_ms),
+        "end_to_end_ms_max": max(end_to_end_ms),
+    }
+
+
+def bench_cpu_per_hour(source, engine):
+    listener = make_listener(engine)
+    position = 0
+    cpu_started = time.process_time()
+    with source:
+        while (pcm := source.read(common.FRAME_LENGTH)) is not None:
+            position += pcm.size
+            listener.process(pcm, position)
+    cpu = time.process_time() - cpu_started
+    audio_seconds = position / common.SAMPLE_RATE
+    return {
+        "audio_seconds": audio_seconds,
+        "cpu_seconds": cpu,
+        "cpu_seconds_per_audio_hour": cpu * 3600.0 / audio_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio pipeline benchmarks.")
+    parser.add_argument("--wav", help="Recorded fixture (16 kHz, 16-bit); synthetic audio if omitted")
+    parser.add_argument("--seconds", type=float, default=300.0, help="Length of the synthetic fixture")
+    parser.add_argument("--access-key", help="Porcupine key; benchmarks the real engine when set")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    engine, engine_name = common.keyword_engine(args.access_key)
+    results = {
+        "keyword_engine": engine_name,
+        "fixture": args.wav or f"synthetic:{args.seconds:g}s",
+        "frame_cost": bench_frame_cost(common.fixture(args.wav, args.seconds), engine),
+        "clap_detector": bench_clap_detector(
+            common.fixture(args.wav, args.seconds, frames_per_buffer=config.CHUNK_SIZE)),
+        "wake_to_action": bench_wake_to_action(min(args.seconds, 300.0)),
+        "cpu_per_audio_hour": bench_cpu_per_hour(common.fixture(args.wav, args.seconds), engine),
+    }
+    engine.delete()
+    common.write_results("pipeline", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
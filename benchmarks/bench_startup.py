@@ -0,0 +1,172 @@
+"""
+Cold-start benchmark: launch the engine in fresh interpreters and time each
+startup stage.
+
+Every run is a new Python process that imports the engine, builds a
+VoiceLauncher on synthetic audio and waits for the first processed frame.
+The stage breakdown comes from startup.profiler; launch_to_first_frame is
+measured by this parent process from spawn, so it includes interpreter
+startup. The first run is reported separately (first_ms), since it is the
+one that pays for cold disk caches.
+
+Measures:
+    import_engine        importing voice_launcher and its dependencies
+    construct            VoiceLauncher() (no devices opened)
+    keyword_engine, microphone, sound_output, tts_cache, metrics_endpoint
+                         the initialize() stages on the engine thread
+    mic_live, online, first_frame
+                         milestones, measured from the first import
+    launch_to_first_frame
+                         process spawn to first processed frame
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--cold] [--output results.json]
+
+--cold gives every run an empty bytecode cache (PYTHONPYCACHEPREFIX), so all
+modules are compiled from source as on a first launch after install.
+
+The child sends its report over a dedicated pipe, not stdout, so prints
+from the engine's own threads cannot corrupt it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(access_key, result_fd):
+    """One launch; writes the profiler report as one JSON line to ``result_fd``."""
+    sys.path.insert(0, ROOT)
+    from startup import profiler
+
+    with profiler.stage("import engine"):
+        import voice_launcher
+
+    import dataclasses
+
+    import common
+    import config
+    from config_store import ConfigSnapshot, ConfigStore
+    from log_store import LogStore
+
+    # Never collide with a running instance.
+    config.METRICS_PORT = 0
+    config.METRICS_JSON_PATH = None
+    config.CONTROL_SOCKET = None
+    if access_key:
+        factory, engine_name = voice_launcher.create_porcupine, "porcupine"
+    else:
+        factory, engine_name = (lambda key, keywords: common.NullKeywordEngine()), "null"
+    defaults = dataclasses.replace(ConfigSnapshot.from_module(), access_key=access_key or "benchmark",
+                                   debug_mode=False)
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the user's files untouched.
+        config.TTS_CACHE_DIR = os.path.join(directory, "tts")
+        config.LOG_FILE = os.path.join(directory, "jarvis.log")
+        store = ConfigStore(os.path.join(directory, "config.json"), defaults)
+        with profiler.stage("construct"):
+            launcher = voice_launcher.VoiceLauncher(
+                source=common.synthetic_clip(5.0),
+                store=store,
+                log_store=LogStore(),
+                keyword_factory=factory,
+            )
+        launcher.start()
+        while launcher.m_frames.total() == 0 and launcher._thread.is_alive():
+            time.sleep(0.0005)
+        profiler.mark("first frame")
+        report = profiler.report()
+        report["keyword_engine"] = engine_name
+        with os.fdopen(result_fd, "w") as result:
+            result.write(json.dumps(report) + "\n")
+        launcher.stop()
+        launcher.wait(5.0)
+
+
+def launch(access_key, cold):
+    """Run one child process and return its timings in milliseconds."""
+    env = dict(os.environ)
+    cache = None
+    if cold:
+        cache = tempfile.TemporaryDirectory()
+        env["PYTHONPYCACHEPREFIX"] = cache.name
+    read_fd, write_fd = os.pipe()
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--result-fd", str(write_fd)]
+    if access_key:
+        command += ["--access-key", access_key]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               env=env, cwd=ROOT, pass_fds=(write_fd,))
+    os.close(write_fd)
+    report = None
+    with os.fdopen(read_fd) as result:
+        line = result.readline()
+        if line:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            report = json.loads(line)
+    process.wait()
+    if cache:
+        cache.cleanup()
+    if report is None:
+        raise RuntimeError(f"startup run failed (exit status {process.returncode})")
+
+    timings = {"launch_to_first_frame": elapsed_ms}
+    for stage in report["stages"]:
+        timings[stage["name"].replace(" ", "_")] = stage["ms"]
+    for name, at in report["marks"].items():
+        timings[name.replace(" ", "_")] = at
+    return timings, report["keyword_engine"]
+
+
+def summarize(runs):
+    summary = {}
+    for name in runs[0]:
+        values = [run[name] for run in runs if name in run]
+        summary[name] = {
+            "first_ms": values[0],
+            "median_ms": statistics.median(values),
+            "min_ms": min(values),
+            "max_ms": max(values),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes to launch")
+    parser.add_argument("--cold", action="store_true", help="Empty bytecode cache for every run")
+    parser.add_argument("--access-key", help="Porcupine key; times the real model load when set")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result-fd", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    access_key = args.access_key or os.environ.get("PORCUPINE_ACCESS_KEY")
+
+    if args.child:
+        child(access_key, args.result_fd)
+        return
+
+    import common
+
+    runs = []
+    engine_name = None
+    for _ in range(args.runs):
+        timings, engine_name = launch(access_key, args.cold)
+        runs.append(timings)
+    results = {
+        "keyword_engine": engine_name,
+        "runs": args.runs,
+        "cold": args.cold,
+        "timings": summarize(runs),
+    }
+    common.write_results("startup", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
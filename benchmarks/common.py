@@ -0,0 +1,115 @@
+"""
+Shared fixtures and reporting for the benchmark scripts.
+
+Benchmarks run without a microphone: audio comes from SyntheticSource or a
+recorded WAV/raw file, and the keyword engine is real Porcupine only when an
+access key is available (otherwise a no-op engine, so the numbers cover our
+own code rather than the model).
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from audio_sources import FileSource, SyntheticSource  # noqa: E402
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 512
+
+# Clap groups used by the synthetic fixtures, repeated every 30 seconds of
+# audio: a double clap, a triple clap and a stray single clap.
+CLAP_GROUPS = ((1.0, 1.45), (11.0, 11.4, 11.8), (21.0,))
+FIXTURE_PERIOD = 30
+
+
+class NullKeywordEngine:
+    """Stand-in for Porcupine that never fires; isolates pipeline cost."""
+
+    sample_rate = SAMPLE_RATE
+    frame_length = FRAME_LENGTH
+
+    def process(self, pcm):
+        return -1
+
+    def delete(self):
+        pass
+
+
+class ScriptedKeywordEngine(NullKeywordEngine):
+    """Fires keyword 0 on the given frame numbers."""
+
+    def __init__(self, frames):
+        self.frames = set(frames)
+        self.count = 0
+
+    def process(self, pcm):
+        self.count += 1
+        return 0 if self.count in self.frames else -1
+
+
+def keyword_engine(access_key=None, keyword="jarvis"):
+    """Real Porcupine when a key is given and the package is installed."""
+    access_key = access_key or os.environ.get("PORCUPINE_ACCESS_KEY")
+    if access_key:
+        try:
+            import pvporcupine
+            return pvporcupine.create(access_key=access_key, keywords=[keyword]), "porcupine"
+        except Exception as e:
+            print(f"[WARN] Porcupine unavailable ({e}); using null engine", file=sys.stderr)
+    return NullKeywordEngine(), "null"
+
+
+def clap_groups(seconds):
+    """Absolute clap times of the synthetic fixture, grouped per pattern."""
+    groups = []
+    for base in range(0, int(seconds), FIXTURE_PERIOD):
+        for group in CLAP_GROUPS:
+            if base + group[-1] < seconds:
+                groups.append(tuple(base + t for t in group))
+    return groups
+
+
+def synthetic_clip(seconds, seed=0, noise_rms=150.0, frames_per_buffer=FRAME_LENGTH):
+    """Room-noise fixture with CLAP_GROUPS repeated every FIXTURE_PERIOD seconds."""
+    claps = [t for group in clap_groups(seconds) for t in group]
+    return SyntheticSource(sample_rate=SAMPLE_RATE, frames_per_buffer=frames_per_buffer,
+                           duration=seconds, noise_rms=noise_rms, claps=claps, seed=seed)
+
+
+def fixture(path=None, seconds=60.0, frames_per_buffer=FRAME_LENGTH):
+    """A recorded file when ``path`` is given, else the synthetic clip."""
+    if path:
+        return FileSource(path, sample_rate=SAMPLE_RATE, frames_per_buffer=frames_per_buffer)
+    return synthetic_clip(seconds, frames_per_buffer=frames_per_buffer)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def write_results(name, results, output=None):
+    """Print results as JSON and optionally write them to ``output``."""
+    report = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    return report
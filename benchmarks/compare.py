@@ -0,0 +1,69 @@
+"""
+Compare two benchmark JSON reports and flag regressions.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--tolerance 0.10]
+
+Exits with status 1 when any metric got worse by more than the tolerance.
+"""
+import argparse
+import json
+import sys
+
+# Metrics where a bigger number is better; everything else timing-like is
+# treated as lower-is-better.
+HIGHER_IS_BETTER = ("samples_per_sec", "realtime_factor", "speedup")
+LOWER_IS_BETTER = ("_us", "_ms", "seconds", "cpu")
+
+
+def flatten(tree, prefix=""):
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, value
+
+
+def direction(path):
+    leaf = path.rsplit(".", 1)[-1]
+    if any(leaf.endswith(k) for k in HIGHER_IS_BETTER):
+        return 1
+    if any(k in leaf for k in LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark reports.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        base = json.load(f)
+    with open(args.candidate) as f:
+        cand = json.load(f)
+
+    before = dict(flatten(base["results"]))
+    after = dict(flatten(cand["results"]))
+    print(f"{base.get('commit')} -> {cand.get('commit')}")
+
+    regressions = 0
+    for path in sorted(before.keys() & after.keys()):
+        sign = direction(path)
+        old, new = before[path], after[path]
+        if not sign or old == 0:
+            continue
+        change = (new - old) / abs(old)
+        worse = -change * sign > args.tolerance
+        regressions += worse
+        marker = "REGRESSION" if worse else ""
+        print(f"{path:<50}{old:>14.3f}{new:>14.3f}{change * 100:>+9.1f}%  {marker}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
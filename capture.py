@@ -0,0 +1,272 @@
+import threading
+import time
+import weakref
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size int16 sample ring shared by one writer and many readers.
+
+    Positions are absolute sample indices since the buffer was created, so
+    readers can tell exactly how far behind the writer they are.
+
+    A ``blocking`` ring never overwrites unread data: write() waits until a
+    reader exists and every reader has room for the new samples. That is
+    the backpressure offline sources (files, synthetic audio) need, since
+    nothing else paces them.
+    """
+
+    def __init__(self, capacity, blocking=False):
+        self.capacity = int(capacity)
+        self.blocking = blocking
+        self._buf = np.zeros(self.capacity, dtype=np.int16)
+        self._write_pos = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._readers = weakref.WeakSet()
+
+    @property
+    def write_pos(self):
+        return self._write_pos
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def write(self, samples):
+        """
+        Append samples, overwriting the oldest data once the ring is full
+        (or, for a blocking ring, waiting until the slowest reader has room).
+        """
+        samples = np.asarray(samples, dtype=np.int16)
+        n = samples.size
+        if n == 0:
+            return
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            skipped = n - self.capacity
+            n = self.capacity
+        else:
+            skipped = 0
+        with self._cond:
+            if self.blocking:
+                self._cond.wait_for(lambda: self._closed or self._has_room(n))
+                if self._closed:
+                    return
+            start = (self._write_pos + skipped) % self.capacity
+            first = min(n, self.capacity - start)
+            self._buf[start:start + first] = samples[:first]
+            if first < n:
+                self._buf[:n - first] = samples[first:]
+            self._write_pos += skipped + n
+            self._cond.notify_all()
+
+    def close(self):
+        """Wake every blocked reader; subsequent reads return None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+
+    def reader(self, start=None):
+        """Create an independent reader, by default positioned at the newest sample."""
+        with self._cond:
+            reader = RingReader(self, self._write_pos if start is None else start)
+            self._readers.add(reader)
+            self._cond.notify_all()
+        return reader
+
+    def _has_room(self, n):
+        readers = list(self._readers)
+        return bool(readers) and all(self._write_pos + n - r.position <= self.capacity for r in readers)
+
+    def _copy(self, pos, n):
+        start = pos % self.capacity
+        first = min(n, self.capacity - start)
+        out = np.empty(n, dtype=np.int16)
+        out[:first] = self._buf[start:start + first]
+        if first < n:
+            out[first:] = self._buf[:n - first]
+        return out
+
+
+class RingReader:
+    """A consumer cursor into a RingBuffer."""
+
+    def __init__(self, ring, start):
+        self.ring = ring
+        self.position = start
+        self.overruns = 0
+
+    @property
+    def closed(self):
+        return self.ring.closed
+
+    def available(self):
+        return self.ring.write_pos - self.position
+
+    def seek_to_latest(self):
+        self.position = self.ring.write_pos
+
+    def read(self, n, timeout=None):
+        """
+        Block until n samples past this reader's cursor are available.
+
+        Args:
+            n (int): Number of samples to return.
+            timeout (float): Seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            np.ndarray: n int16 samples, or None on timeout or close.
+        """
+        ring = self.ring
+        with ring._cond:
+            if not ring._cond.wait_for(
+                lambda: ring._closed or ring._write_pos - self.position >= n,
+                timeout=timeout,
+            ):
+                return None
+            if ring._closed and ring._write_pos - self.position < n:
+                return None
+            oldest = ring._write_pos - ring.capacity
+            if self.position < oldest:
+                # This consumer fell a whole ring behind; skip to the oldest
+                # sample that is still intact.
+                self.overruns += 1
+                self.position = oldest
+            data = ring._copy(self.position, n)
+            self.position += n
+            if ring.blocking:
+                ring._cond.notify_all()
+            return data
+
+
+class BlockQueue:
+    """
+    Bounded, preallocated FIFO of fixed-size sample blocks.
+
+    Built for the PortAudio callback: put() never blocks or allocates, and a
+    full queue drops the new block and counts it instead of stalling the
+    audio thread.
+    """
+
+    def __init__(self, slots, block_size):
+        self.slots = slots
+        self.block_size = block_size
+        self._buf = np.zeros((slots, block_size), dtype=np.int16)
+        self._sizes = np.zeros(slots, dtype=np.int64)
+        self._head = 0
+        self._tail = 0
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def put(self, samples):
+        with self._cond:
+            if self._tail - self._head >= self.slots:
+                self.dropped += 1
+                return False
+            slot = self._tail % self.slots
+            n = min(samples.size, self.block_size)
+            self._buf[slot, :n] = samples[:n]
+            self._sizes[slot] = n
+            self._tail += 1
+            self._cond.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Return the oldest block (a copy), or None if none arrives in time."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._tail > self._head, timeout=timeout):
+                return None
+            slot = self._head % self.slots
+            block = self._buf[slot, :self._sizes[slot]].copy()
+            self._head += 1
+            return block
+
+    def clear(self):
+        with self._cond:
+            self._head = self._tail
+
+
+class CaptureStream:
+    """
+    One long-lived audio source feeding a RingBuffer from a background thread.
+
+    Consumers (wake word, claps) each take their own reader, so switching
+    between them never opens or closes the device. Sources that are not
+    realtime are read only as fast as the slowest reader keeps up, so a
+    recording is processed completely rather than overrunning the ring.
+    """
+
+    def __init__(self, source, buffer_seconds=2.0):
+        self.source = source
+        self.rate = source.sample_rate
+        self.frames_per_buffer = source.frames_per_buffer
+        self.ring = RingBuffer(int(self.rate * buffer_seconds),
+                               blocking=not getattr(source, "realtime", False))
+        self._thread = None
+        self._running = False
+        self.read_errors = 0
+        # Set when a finite source runs out, as opposed to a stop().
+        self.ended = False
+
+    def start(self):
+        if self._running:
+            return
+        self.source.open()
+        self.ended = False
+        self.ring.reopen()
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="audio-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        # Closing first also releases a writer waiting on a blocking ring.
+        self.ring.close()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.source.close()
+
+    @property
+    def is_active(self):
+        return self._running
+
+    def reader(self, start=None):
+        return self.ring.reader(start)
+
+    def stats(self):
+        """Loss counters: device overflows, queue drops and read errors."""
+        return {
+            "overflows": getattr(self.source, "overflows", 0),
+            "dropped": getattr(self.source, "dropped", 0),
+            "read_errors": self.read_errors,
+        }
+
+    def _capture_loop(self):
+        while self._running:
+            try:
+                samples = self.source.read(self.frames_per_buffer)
+            except Exception as e:
+                if not self._running:
+                    break
+                self.read_errors += 1
+                print(f"[ERROR] Audio read error: {e}")
+                time.sleep(0.01)
+                continue
+            if samples is None:
+                # End of a finite source (file or synthetic).
+                self.ended = True
+                self._running = False
+                self.ring.close()
+                break
+            self.ring.write(samples)
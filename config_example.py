@@ -17,14 +17,55 @@ SAMPLE_RATE = 16000
 # Audio chunk size. 1024 is standard for low latency.
 CHUNK_SIZE = 1024
 
-# Amplitude threshold for clap detection (0-32767 for 16-bit audio).
+# Amplitude threshold for clap detection (0-32767 for 16-bit audio), compared
+# against the 1 ms envelope of the signal.
 # - Increase if the system triggers on background noise.
 # - Decrease if it misses your claps.
 CLAP_THRESHOLD = 1500
 
+# Derive the threshold from the room instead: a running noise-floor estimate
+# plus AUTO_THRESHOLD_MARGIN_DB, never below AUTO_THRESHOLD_MIN. CLAP_THRESHOLD
+# is ignored while this is on. Toggle it live from the dashboard.
+AUTO_THRESHOLD = False
+AUTO_THRESHOLD_MARGIN_DB = 20.0
+AUTO_THRESHOLD_MIN = 300
+
 # Maximum time (in seconds) allowed between claps to consider them a sequence.
 CLAP_INTERVAL = 1.0
 
+# Minimum time (in seconds) between two claps; anything closer is treated as
+# the echo of the previous clap.
+CLAP_MIN_GAP = 0.15
+
+# Seconds of audio kept in the shared capture ring buffer. The wake-word and
+# clap detectors read from the same always-open stream through this buffer.
+RING_BUFFER_SECONDS = 2.0
+
+# "callback" lets PortAudio push audio into a preallocated queue so a slow
+# step (launching apps, UI updates) never blocks the microphone. "blocking"
+# uses plain stream.read() calls instead.
+CAPTURE_MODE = "callback"
+
+# Number of buffers the callback queue holds before new audio is dropped
+# (and counted). 32 x 512 samples is about one second at 16 kHz.
+CAPTURE_QUEUE_BLOCKS = 32
+
+# Input devices to listen on, each with its own capture and detection
+# thread: PortAudio device indexes or parts of device names, e.g.
+# ["MacBook Pro Microphone", "USB"]. Empty means the default device. When a
+# wake word is heard on several devices within FUSION_WINDOW_SECONDS, the
+# one with the best signal-to-noise ratio takes the session.
+INPUT_DEVICES = []
+FUSION_WINDOW_SECONDS = 0.5
+
+# Skip wake-word inference on frames less than KEYWORD_GATE_MARGIN_DB above
+# the noise floor (saves CPU in quiet rooms). The last
+# KEYWORD_GATE_LOOKBACK_SECONDS of skipped audio are replayed into the engine
+# when the gate opens, so the start of the wake word is never lost.
+KEYWORD_GATE = True
+KEYWORD_GATE_MARGIN_DB = 6.0
+KEYWORD_GATE_LOOKBACK_SECONDS = 0.5
+
 
 # ==============================================================================
 # 3. SYSTEM SETTINGS
@@ -32,13 +73,49 @@ CLAP_INTERVAL = 1.0
 # How long the system listens for claps after the wake word is detected (seconds).
 ACTIVE_DURATION = 30
 
+# What hearing the wake word again during a clap session does:
+# "rearm" restarts the session window, "cancel" ends the session.
+WAKE_DURING_SESSION = "rearm"
+
 # The wake word to listen for.
 # Must be one of the AVAILABLE_WAKE_WORDS below unless you have a custom file.
 DEFAULT_WAKE_WORD = "jarvis"
 
+# How many times per second the HUD orb receives a new audio level. The
+# loudest level between updates is held, so claps are never missed.
+HUD_LEVEL_RATE = 15
+
+# Upper bound on HUD orb repaints per second; animation ticks in between
+# are coalesced into the next frame.
+HUD_MAX_FPS = 30
+
+# The dashboard opens once the microphone is live (startup never waits on
+# it), or after this many milliseconds if the engine is slow to report in.
+SETTINGS_OPEN_DELAY_MS = 3000
+
+# Spoken reply when the wake word is heard, and the macOS 'say' voice used.
+# Each (text, voice) pair is synthesized once and replayed from a cache.
+WAKE_RESPONSE = "Yes, Sir"
+TTS_VOICE = "Daniel"
+
+# Where rendered speech is stored (None: the platform cache directory), and
+# its size limit in bytes.
+TTS_CACHE_DIR = None
+TTS_CACHE_BYTES = 32 * 1024 * 1024
+
 # Debug mode prints detailed logs to the console.
 DEBUG_MODE = True
 
+# Status log: the last LOG_BUFFER_LINES lines are kept in memory (and shown
+# by the dashboard, which refreshes every LOG_FLUSH_MS); everything is also
+# written to LOG_FILE (None: the platform log directory), rotated at
+# LOG_FILE_BYTES with LOG_FILE_BACKUPS old files.
+LOG_BUFFER_LINES = 2000
+LOG_FLUSH_MS = 200
+LOG_FILE = None
+LOG_FILE_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
 
 # ==============================================================================
 # 4. PATH SETTINGS
@@ -47,10 +124,41 @@ DEBUG_MODE = True
 DEFAULT_PROJECT_PATH = os.path.expanduser("~/Downloads/Development")
 
 
+# Cue sounds. They are decoded once at startup and played from memory
+# through a single output stream (AIFF or WAV).
+SOUNDS = {
+    "startup": "/System/Library/Sounds/Blow.aiff",
+    "wake": "/System/Library/Sounds/Hero.aiff",
+    "success": "/System/Library/Sounds/Glass.aiff",
+    "error": "/System/Library/Sounds/Basso.aiff",
+}
+
+# Upper bound (bytes) on decoded sounds kept in memory.
+SOUND_CACHE_BYTES = 16 * 1024 * 1024
+
+# Metrics (frame counts, audio loss, detections, latency histograms) served
+# as Prometheus text on http://127.0.0.1:METRICS_PORT/metrics (0 disables),
+# and optionally written as JSON to METRICS_JSON_PATH every
+# METRICS_JSON_INTERVAL seconds.
+METRICS_PORT = 9464
+METRICS_JSON_PATH = None  # e.g. os.path.expanduser("~/Library/Logs/Jarvis/metrics.json")
+METRICS_JSON_INTERVAL = 60
+
+# Local control API (pause, resume, trigger, state, metrics) on a Unix
+# socket only this user can open; see jarvisctl.py. None disables it.
+CONTROL_SOCKET = os.path.expanduser("~/Library/Application Support/Jarvis/control.sock")
+
+
 # ==============================================================================
 # 5. APP CONFIGURATIONS
 # ==============================================================================
+# Worker threads that launch actions. All commands of one clap action are
+# started concurrently, off the audio thread.
+ACTION_WORKERS = 4
+
 # List of apps/commands to launch on DOUBLE CLAP.
+# Optional per-command "timeout" (seconds): wait for the command to exit and
+# stop it if it takes longer.
 APPS_TO_LAUNCH = [
     {
         "command": "code",
@@ -66,6 +174,17 @@ SECONDARY_ACTION = {
     "type_msg": "Playing YouTube Video"
 }
 
+# Extra keywords, all heard by the same engine in one pass over the audio.
+# Each maps to its own clap table: clap count -> list of actions. The wake
+# word uses APPS_TO_LAUNCH (2 claps) and SECONDARY_ACTION (3 claps) unless
+# it is listed here too. Keywords must be in AVAILABLE_WAKE_WORDS.
+KEYWORD_ACTIONS = {
+    # "computer": {
+    #     2: [{"command": "open", "args": ["-a", "Terminal"], "type_msg": "Opening Terminal"}],
+    #     3: [{"command": "open", "args": ["-a", "Activity Monitor"], "type_msg": "Opening Activity Monitor"}],
+    # },
+}
+
 
 # ==============================================================================
 # 6. AVAILABLE WAKE WORDS
@@ -0,0 +1,264 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+
+import config
+
+
+class ConfigError(ValueError):
+    """A setting failed validation."""
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of the live-tunable settings."""
+
+    access_key: str
+    wake_word: str
+    clap_threshold: float
+    clap_interval: float
+    clap_min_gap: float
+    auto_threshold: bool
+    auto_threshold_margin_db: float
+    active_duration: float
+    wake_during_session: str
+    wake_response: str
+    tts_voice: str
+    debug_mode: bool
+
+    @classmethod
+    def from_module(cls, module=config):
+        """Defaults taken from config.py."""
+        return cls(
+            access_key=module.PORCUPINE_ACCESS_KEY,
+            wake_word=module.DEFAULT_WAKE_WORD,
+            clap_threshold=float(module.CLAP_THRESHOLD),
+            clap_interval=float(module.CLAP_INTERVAL),
+            clap_min_gap=float(getattr(module, "CLAP_MIN_GAP", 0.15)),
+            auto_threshold=bool(getattr(module, "AUTO_THRESHOLD", False)),
+            auto_threshold_margin_db=float(getattr(module, "AUTO_THRESHOLD_MARGIN_DB", 20.0)),
+            active_duration=float(module.ACTIVE_DURATION),
+            wake_during_session=getattr(module, "WAKE_DURING_SESSION", "rearm"),
+            wake_response=getattr(module, "WAKE_RESPONSE", "Yes, Sir"),
+            tts_voice=getattr(module, "TTS_VOICE", "Daniel"),
+            debug_mode=bool(module.DEBUG_MODE),
+        )
+
+    def validate(self):
+        if not 1 <= self.clap_threshold <= 32767:
+            raise ConfigError(f"clap_threshold must be 1-32767, got {self.clap_threshold}")
+        if self.clap_interval <= 0:
+            raise ConfigError(f"clap_interval must be positive, got {self.clap_interval}")
+        if not 0 <= self.clap_min_gap < self.clap_interval:
+            raise ConfigError(f"clap_min_gap must be between 0 and clap_interval, got {self.clap_min_gap}")
+        if not 0 <= self.auto_threshold_margin_db <= 60:
+            raise ConfigError(f"auto_threshold_margin_db must be 0-60, got {self.auto_threshold_margin_db}")
+        if self.active_duration <= 0:
+            raise ConfigError(f"active_duration must be positive, got {self.active_duration}")
+        if self.wake_during_session not in ("rearm", "cancel"):
+            raise ConfigError(f"wake_during_session must be 'rearm' or 'cancel', got {self.wake_during_session!r}")
+        if not self.wake_word:
+            raise ConfigError("wake_word must not be empty")
+        return self
+
+
+# JSON layout of config.json: section -> {json key: snapshot field}.
+# Top-level keys use the section None.
+_LAYOUT = {
+    None: {"porcupine_access_key": "access_key"},
+    "system": {
+        "wake_word": "wake_word",
+        "active_duration": "active_duration",
+        "wake_during_session": "wake_during_session",
+        "wake_response": "wake_response",
+        "tts_voice": "tts_voice",
+        "debug_mode": "debug_mode",
+    },
+    "audio": {
+        "clap_threshold": "clap_threshold",
+        "clap_interval": "clap_interval",
+        "clap_min_gap": "clap_min_gap",
+        "auto_threshold": "auto_threshold",
+        "auto_threshold_margin_db": "auto_threshold_margin_db",
+    },
+}
+
+_TYPES = {
+    "access_key": str, "wake_word": str, "wake_during_session": str,
+    "wake_response": str, "tts_voice": str, "debug_mode": bool, "auto_threshold": bool,
+    "clap_threshold": float, "clap_interval": float, "clap_min_gap": float,
+    "auto_threshold_margin_db": float,
+    "active_duration": float,
+}
+
+
+def _coerce(field, value):
+    kind = _TYPES[field]
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise ConfigError(f"{field} must be true or false, got {value!r}")
+        return value
+    if kind is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ConfigError(f"{field} must be a number, got {value!r}")
+        return float(value)
+    if not isinstance(value, str):
+        raise ConfigError(f"{field} must be a string, got {value!r}")
+    return value
+
+
+def snapshot_to_json(snapshot):
+    values = asdict(snapshot)
+    data = {}
+    for section, keys in _LAYOUT.items():
+        target = data if section is None else data.setdefault(section, {})
+        for json_key, field in keys.items():
+            target[json_key] = values[field]
+    return data
+
+
+def snapshot_from_json(data, base):
+    """Overlay a parsed config.json on ``base``; unknown keys are ignored."""
+    changes = {}
+    for section, keys in _LAYOUT.items():
+        source = data if section is None else data.get(section, {})
+        if not isinstance(source, dict):
+            raise ConfigError(f"'{section}' must be an object")
+        for json_key, field in keys.items():
+            if json_key in source:
+                changes[field] = _coerce(field, source[json_key])
+    return replace(base, **changes).validate()
+
+
+class ConfigStore:
+    """
+    Typed, validated settings with atomic JSON persistence and hot reload.
+
+    config.py supplies the defaults; config.json (written by the settings
+    window, or edited by hand) overrides them. Every change produces a new
+    immutable ConfigSnapshot that is pushed to subscribers, so the running
+    engine picks it up on its next frame without a restart.
+    """
+
+    def __init__(self, path, defaults=None):
+        self.path = path
+        self.defaults = defaults or ConfigSnapshot.from_module()
+        self._snapshot = self.defaults
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._watcher = None
+        self._watching = False
+        self.load()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """Call ``callback(snapshot)`` on every change (from the changing thread)."""
+        self._subscribers.append(callback)
+
+    def _publish(self, snapshot):
+        self._snapshot = snapshot
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"[ERROR] Config subscriber failed: {e}")
+
+    def load(self):
+        """(Re)read config.json. Invalid files are reported and ignored."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self._snapshot
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            snapshot = snapshot_from_json(data, self.defaults)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Ignoring invalid {self.path}: {e}")
+            self._mtime = mtime
+            return self._snapshot
+        self._mtime = mtime
+        if snapshot != self._snapshot:
+            self._publish(snapshot)
+        return snapshot
+
+    def update(self, persist=True, **changes):
+        """
+        Apply validated changes and publish the new snapshot.
+
+        Args:
+            persist (bool): Also write config.json. Pass False for live
+                previews (e.g. while a slider is being dragged).
+            **changes: ConfigSnapshot field values.
+
+        Returns:
+            ConfigSnapshot: The new snapshot.
+
+        Raises:
+            ConfigError: If a value has the wrong type or is out of range.
+        """
+        with self._lock:
+            coerced = {field: _coerce(field, value) for field, value in changes.items()}
+            snapshot = replace(self._snapshot, **coerced).validate()
+            if persist:
+                self._write(snapshot)
+            if snapshot != self._snapshot:
+                self._publish(snapshot)
+            return snapshot
+
+    def _write(self, snapshot):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".config.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot_to_json(snapshot), f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        # Our own write should not come back through the watcher.
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def start_watching(self, interval=1.0):
+        """Poll config.json for external edits on a background thread."""
+        if self._watching:
+            return
+        self._watching = True
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="config-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._watching = False
+
+    def _watch(self, interval):
+        while self._watching:
+            time.sleep(interval)
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                continue
+            if mtime != self._mtime:
+                with self._lock:
+                    self.load()
+
+
+_default_store = None
+
+
+def default_store():
+    """The process-wide store backed by config.json next to config.py."""
+    global _default_store
+    if _default_store is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(config.__file__)), "config.json")
+        _default_store = ConfigStore(path)
+    return _default_store
@@ -0,0 +1,149 @@
+import json
+import os
+import shlex
+import socket
+import socketserver
+import sys
+import threading
+
+if sys.platform == "darwin":
+    DEFAULT_SOCKET = os.path.expanduser("~/Library/Application Support/Jarvis/control.sock")
+elif os.environ.get("XDG_RUNTIME_DIR"):
+    DEFAULT_SOCKET = os.path.join(os.environ["XDG_RUNTIME_DIR"], "jarvis", "control.sock")
+else:
+    DEFAULT_SOCKET = os.path.expanduser("~/.cache/jarvis/control.sock")
+
+
+class ControlError(Exception):
+    """A control request that could not be carried out."""
+
+
+class ControlServer:
+    """
+    Line-based control API on a Unix-domain socket.
+
+    Each request is one line, ``command arg ...`` (shell-style quoting, so
+    ``trigger 3 "hey google"`` works), and gets one JSON line back:
+    ``{"ok": true, "result": {...}}`` or ``{"ok": false, "error": "..."}``.
+    A client may keep the connection open and send any number of requests.
+
+    ``commands`` maps a command name to a callable taking the arguments as
+    strings and returning a JSON-serializable dict. Handlers run on the
+    connection's thread, so they must be thread-safe; raising ControlError
+    (or TypeError for a wrong argument count) reports the message.
+
+    The socket is created with mode 0600 in a 0700 directory: only the
+    current user can connect.
+    """
+
+    def __init__(self, commands, path=DEFAULT_SOCKET):
+        self.commands = commands
+        self.path = os.path.expanduser(path)
+        self._server = None
+
+    def start(self):
+        commands = self.commands
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    response = dispatch(commands, line.decode("utf-8", "replace"))
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._remove_stale_socket()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="control-socket", daemon=True).start()
+        return self
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            # Left behind by a process that did not shut down cleanly.
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise OSError(f"another instance is listening on {self.path}")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+def dispatch(commands, line):
+    """Run one request line against ``commands`` and build the response."""
+    try:
+        words = shlex.split(line)
+    except ValueError as e:
+        return {"ok": False, "error": f"bad request: {e}"}
+    if not words:
+        return {"ok": False, "error": "empty request"}
+    name, args = words[0], words[1:]
+    handler = commands.get(name)
+    if handler is None:
+        return {"ok": False, "error": f"unknown command '{name}' (try: {', '.join(sorted(commands))})"}
+    try:
+        return {"ok": True, "result": handler(*args)}
+    except (ControlError, TypeError, ValueError) as e:
+        return {"ok": False, "error": str(e)}
+    except Exception as e:
+        print(f"[ERROR] Control command '{name}' failed: {e}")
+        return {"ok": False, "error": f"internal error: {e}"}
+
+
+class ControlClient:
+    """Persistent connection to a ControlServer."""
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=5.0):
+        self.path = os.path.expanduser(path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.path)
+        self._file = self._sock.makefile("rb")
+
+    def call(self, command, *args):
+        """
+        Send one request and wait for its response.
+
+        Returns:
+            dict: The command's result.
+
+        Raises:
+            ControlError: If the server reports an error.
+        """
+        line = " ".join(shlex.quote(str(word)) for word in (command, *args))
+        self._sock.sendall(line.encode("utf-8") + b"\n")
+        reply = self._file.readline()
+        if not reply:
+            raise ControlError("connection closed by the server")
+        response = json.loads(reply)
+        if not response["ok"]:
+            raise ControlError(response["error"])
+        return response["result"]
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,33 @@
+import threading
+
+
+class Signal:
+    """
+    Minimal observer list with the connect/emit shape of a Qt signal.
+
+    emit() calls every connected callback synchronously, in the emitting
+    thread. A callback that raises is reported and does not stop the others
+    (or the audio loop that emitted). UI toolkits that need their own thread
+    should connect through an adapter such as qt_adapter.QtEngineBridge.
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def connect(self, callback):
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+
+    def disconnect(self, callback):
+        with self._lock:
+            self._callbacks = [c for c in self._callbacks if c != callback]
+
+    def emit(self, *args):
+        # Copy-on-write list: emitting never takes the lock.
+        for callback in self._callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"[ERROR] {self.name or 'signal'} handler failed: {e}")
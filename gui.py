@@ -1,14 +1,57 @@
-from PyQt6.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, QWidget, QLabel, 
-                             QVBoxLayout, QGraphicsOpacityEffect)
-from PyQt6.QtGui import QIcon, QAction, QPixmap, QColor, QPainter, QRadialGradient, QBrush, QPen
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QRectF, QTimer, pyqtProperty, QSequentialAnimationGroup, QPointF
+from startup import profiler
+with profiler.stage("import PyQt6"):
+    from PyQt6.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, QWidget, QLabel, 
+                                 QVBoxLayout, QGraphicsOpacityEffect)
+    from PyQt6.QtGui import QIcon, QAction, QPixmap, QColor, QPainter, QRadialGradient, QBrush, QPen
+    from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QRectF, QTimer, pyqtProperty, pyqtSignal, QSequentialAnimationGroup, QPointF
+import os
 import sys
-from voice_launcher import VoiceLauncher
+import threading
+import time
+with profiler.stage("import engine"):
+    import config
+    from metrics import default_registry
+    from qt_adapter import QtEngineBridge
+    from voice_launcher import VoiceLauncher
 
 import subprocess
 import random
 
+class FrameLimiter:
+    """
+    Coalesces repaint requests to at most ``fps`` paints per second.
+
+    Property animations tick at the display rate and each tick asks for a
+    repaint; request() turns any burst of those into one update() per frame
+    slot.
+    """
+
+    def __init__(self, widget, fps):
+        self.widget = widget
+        self.interval = 1.0 / fps
+        self._last = 0.0
+        self._timer = QTimer(widget)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+    def request(self):
+        if self._timer.isActive():
+            return
+        wait = self.interval - (time.perf_counter() - self._last)
+        if wait <= 0:
+            self._fire()
+        else:
+            self._timer.start(int(wait * 1000) + 1)
+
+    def _fire(self):
+        self._last = time.perf_counter()
+        self.widget.update()
+
+
 class PulseOrb(QWidget):
+    # Largest pulse_scale set_audio_level can produce (0.8 + 1.0 * 0.7).
+    MAX_SCALE = 1.5
+
     def __init__(self):
         super().__init__()
         self.setFixedSize(80, 80) # Increased size for rings
@@ -17,6 +60,11 @@ class PulseOrb(QWidget):
         self._rotation = 0.0
         self._anim_group = None
         self._is_breathing = False 
+        # Pre-rendered layers, keyed by (color, size, device pixel ratio).
+        self._layers = {}
+        self._frames = FrameLimiter(self, getattr(config, "HUD_MAX_FPS", 30))
+        self._paints = default_registry.counter("jarvis_hud_paints_total", "PulseOrb frames painted")
+        self._paint_seconds = default_registry.histogram("jarvis_hud_paint_seconds", "PulseOrb paintEvent time")
 
     @pyqtProperty(float)
     def pulse_scale(self):
@@ -25,7 +73,7 @@ class PulseOrb(QWidget):
     @pulse_scale.setter
     def pulse_scale(self, value):
         self._pulse_scale = value
-        self.update()
+        self._frames.request()
 
     @pyqtProperty(float)
     def rotation(self):
@@ -34,7 +82,7 @@ class PulseOrb(QWidget):
     @rotation.setter
     def rotation(self, value):
         self._rotation = value
-        self.update()
+        self._frames.request()
 
     def set_color(self, hex_color):
         self._color = QColor(hex_color)
@@ -86,75 +134,104 @@ class PulseOrb(QWidget):
             
             target_scale = 0.8 + (level * 0.7)
             self._pulse_scale = target_scale
-            self.update()
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._frames.request()
         
-        center = QPointF(self.rect().center())
-        max_radius = min(self.width(), self.height()) / 2.0
-        
-        # 1. Draw Core Pulse
-        current_radius = max_radius * 0.7 * self._pulse_scale # 70% of size is core
-        
-        gradient = QRadialGradient(center.x(), center.y(), current_radius)
-        gradient.setColorAt(0.0, self._color) 
+    def _render_layers(self):
+        """
+        Draw the static parts once per color: the glow at its largest pulse,
+        the solid core, and the rings. paintEvent only scales and rotates them.
+        """
+        dpr = self.devicePixelRatioF()
+        key = (self._color.rgba(), self.width(), self.height(), dpr)
+        layers = self._layers.get(key)
+        if layers:
+            return layers
+        size = min(self.width(), self.height())
+        max_radius = size / 2.0
+
+        def canvas(radius):
+            side = int(round(radius * 2 * dpr)) + 2
+            pixmap = QPixmap(side, side)
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.translate(side / dpr / 2.0, side / dpr / 2.0)
+            return pixmap, painter
+
+        # 1. Core pulse glow (70% of size is core), at the largest scale.
+        glow_radius = max_radius * 0.7 * self.MAX_SCALE
+        glow, painter = canvas(glow_radius)
+        gradient = QRadialGradient(0.0, 0.0, glow_radius)
+        gradient.setColorAt(0.0, self._color)
         c_transparent = QColor(self._color)
         c_transparent.setAlpha(0)
         gradient.setColorAt(1.0, c_transparent)
-        
         painter.setBrush(gradient)
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawEllipse(center, current_radius, current_radius)
-        
-        # Solid Core
+        painter.drawEllipse(QPointF(0.0, 0.0), glow_radius, glow_radius)
+        painter.end()
+
+        # Solid core
         core_radius = max_radius * 0.3
+        core, painter = canvas(core_radius)
         painter.setBrush(self._color)
-        painter.drawEllipse(center, core_radius, core_radius)
-        
-        # 2. Draw Sci-Fi Rings
-        # Save state to rotate canvas
-        painter.save()
-        painter.translate(center)
-        painter.rotate(self._rotation)
-        
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawEllipse(QPointF(0.0, 0.0), core_radius, core_radius)
+        painter.end()
+
+        # 2. Sci-fi rings: outer ring of 3 arcs, plain inner ring.
+        ring_radius = max_radius * 0.85
+        rings, painter = canvas(max_radius)
         pen_color = QColor(self._color)
         pen_color.setAlpha(200)
-        painter.setPen(Qt.PenStyle.SolidLine)
-        
-        # Outer Ring (Broken)
-        ring_radius = max_radius * 0.85
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(pen_color)
-        
-        # Draw 3 arcs
-        # drawPie/drawArc expects rectangle
-        rect = QRectF(-ring_radius, -ring_radius, ring_radius*2, ring_radius*2)
-        # Using drawArc with a Pen would be lines. Using drawPie is wedges.
-        # Let's use Pen for Arcs.
         pen = QPen(pen_color)
         pen.setWidth(2)
         pen.setStyle(Qt.PenStyle.SolidLine)
         painter.setPen(pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        
+        rect = QRectF(-ring_radius, -ring_radius, ring_radius*2, ring_radius*2)
         # Angles are in 1/16th of a degree
         painter.drawArc(rect, 0 * 16, 60 * 16)
         painter.drawArc(rect, 120 * 16, 60 * 16)
         painter.drawArc(rect, 240 * 16, 60 * 16)
-        
-        # Inner Ring (Reverse Rotation - simplified by just static relative to outer or diff speed)
-        # For simple effect, just another ring offset
-        painter.rotate(45) # Offset
         inner_rect = QRectF(-ring_radius*0.7, -ring_radius*0.7, ring_radius*1.4, ring_radius*1.4)
         pen.setWidth(1)
         painter.setPen(pen)
         painter.drawEllipse(inner_rect)
-        
-        painter.restore()
+        painter.end()
+
+        layers = self._layers[key] = {"glow": glow, "core": core, "rings": rings}
+        return layers
+
+    @staticmethod
+    def _draw_centered(painter, pixmap, scale=1.0):
+        w = pixmap.width() / pixmap.devicePixelRatio() * scale
+        h = pixmap.height() / pixmap.devicePixelRatio() * scale
+        painter.drawPixmap(QRectF(-w / 2.0, -h / 2.0, w, h), pixmap, QRectF(pixmap.rect()))
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        layers = self._render_layers()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.translate(QPointF(self.rect().center()))
+
+        # 1. Core pulse: the glow layer was drawn at MAX_SCALE.
+        self._draw_centered(painter, layers["glow"], self._pulse_scale / self.MAX_SCALE)
+        self._draw_centered(painter, layers["core"])
+
+        # 2. Rings, rotated.
+        painter.rotate(self._rotation)
+        self._draw_centered(painter, layers["rings"])
+        painter.end()
+
+        self._paints.inc()
+        self._paint_seconds.observe(time.perf_counter() - started)
 
 class HUDOverlay(QWidget):
+    visibility_changed = pyqtSignal(bool)
+
     # ... (Keep existing init) ...
     def __init__(self):
         super().__init__()
@@ -174,8 +251,14 @@ class HUDOverlay(QWidget):
         self.opacity_effect = QGraphicsOpacityEffect(self)
         self.setGraphicsEffect(self.opacity_effect)
         
+        # Only as large as the orb plus its margins, in the top-right corner:
+        # the opacity effect re-renders the whole window on every frame, so
+        # a full-screen window made each orb frame cost a full-screen blend.
         screen = QApplication.primaryScreen().geometry()
-        self.setGeometry(0, 0, screen.width(), screen.height())
+        margins = self.layout.contentsMargins()
+        width = self.orb.width() + margins.left() + margins.right()
+        height = self.orb.height() + margins.top() + margins.bottom()
+        self.setGeometry(screen.x() + screen.width() - width, screen.y(), width, height)
     
     # ... (Keep existing methods show/hide/update) ...
     def show_listening(self):
@@ -197,6 +280,14 @@ class HUDOverlay(QWidget):
     def update_volume(self, level):
         self.orb.set_audio_level(level)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
+
     def animate_fade(self, start, end, hide_after=False):
         try:
             if self.anim: self.anim.stop()
@@ -211,23 +302,20 @@ class HUDOverlay(QWidget):
             self.anim.finished.connect(self.hide)
         self.anim.start()
 
-from settings_ui import SettingsWindow
+with profiler.stage("import settings UI"):
+    from settings_ui import SettingsWindow
 
 class AudioAutomationApp(QApplication):
     def __init__(self, argv):
         super().__init__(argv)
         self.setQuitOnLastWindowClosed(False)
         self.settings_window = None
+        self._icons = {}
+        for color in self.TRAY_COLORS:
+            self.create_icon(color)
 
         self.tray_icon = QSystemTrayIcon(self)
-        pixmap = QPixmap(16, 16)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(pixmap)
-        painter.setBrush(QColor("#007AFF"))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawEllipse(0, 0, 16, 16)
-        painter.end()
-        self.tray_icon.setIcon(QIcon(pixmap))
+        self.tray_icon.setIcon(self.create_icon("#007AFF"))
         
         self.tray_menu = QMenu()
         self.status_action = QAction("Status: Online", self)
@@ -251,29 +339,53 @@ class AudioAutomationApp(QApplication):
         self.tray_icon.setContextMenu(self.tray_menu)
         self.tray_icon.show()
         
-        self.hud = HUDOverlay()
+        with profiler.stage("HUD"):
+            self.hud = HUDOverlay()
+        # Cheap: the keyword engine and devices are opened on the engine
+        # thread once start() is called.
         self.thread = VoiceLauncher()
-        self.thread.wake_detected.connect(self.set_listening_state)
-        # self.thread.listening_claps.connect(self.set_listening_state) # Duplicate causing double speak
-        self.thread.success.connect(self.set_success_state)
-        self.thread.audio_level.connect(self.hud.update_volume)
-        self.thread.log_signal.connect(self.log_message)
+        # Engine callbacks arrive on its audio thread; the bridge re-emits
+        # them as Qt signals delivered on the GUI thread.
+        self.engine_signals = QtEngineBridge(self.thread, self)
+        self.engine_signals.online.connect(self.on_engine_online)
+        # Pause/resume may also come from the control socket (jarvisctl.py).
+        self.engine_signals.paused.connect(self.on_paused)
+        self.engine_signals.wake_detected.connect(self.set_listening_state)
+        # self.engine_signals.listening_claps.connect(self.set_listening_state) # Duplicate causing double speak
+        self.engine_signals.success.connect(self.set_success_state)
+        self.engine_signals.audio_level.connect(self.hud.update_volume)
+        # Only feed levels while the orb is on screen.
+        self.thread.set_level_feed_enabled(self.hud.isVisible())
+        self.hud.visibility_changed.connect(self.thread.set_level_feed_enabled)
+        # Share the engine's output stream and cue cache for UI sounds too.
+        self.sounds = self.thread.sound_player
+        # The microphone starts before any settings UI is built.
         self.thread.start()
+        threading.Thread(target=self.sounds.preload, args=([self.system_sound_path("Glass")],),
+                         name="ui-sound-preload", daemon=True).start()
         
         # Initial State
         self.reset_state()
         
-        # Open UI on startup so user sees something happening
-        try:
-            self.open_settings()
-        except Exception as e:
-            print(f"CRITICAL ERROR Opening Settings: {e}")
-            import traceback
-            traceback.print_exc()
+        # Open UI on startup so user sees something happening: once the
+        # engine reports in, or after SETTINGS_OPEN_DELAY_MS at the latest.
+        self._startup_settings_opened = False
+        QTimer.singleShot(getattr(config, "SETTINGS_OPEN_DELAY_MS", 3000), self.open_startup_settings)
+        QTimer.singleShot(0, lambda: profiler.mark("event loop"))
             
         print("GUI Application Started")
         
+    # Tray colors: idle white/gray, listening blue, muted red, success green.
+    TRAY_COLORS = ("#FFFFFF", "#8E8E93", "#007AFF", "#FF3B30", "#34C759")
+
     def create_icon(self, color):
+        """Tray icon for ``color``, painted once and then reused."""
+        icon = self._icons.get(color)
+        if icon is None:
+            icon = self._icons[color] = self._paint_icon(color)
+        return icon
+
+    def _paint_icon(self, color):
         pixmap = QPixmap(16, 16)
         pixmap.fill(Qt.GlobalColor.transparent)
         painter = QPainter(pixmap)
@@ -283,25 +395,47 @@ class AudioAutomationApp(QApplication):
         painter.end()
         return QIcon(pixmap)
 
+    def on_engine_online(self, ok):
+        if not ok:
+            self.status_action.setText("Status: Offline")
+            self.tray_icon.setIcon(self.create_icon("#FF3B30"))
+        self.open_startup_settings()
+
+    def open_startup_settings(self):
+        if self._startup_settings_opened:
+            return
+        self._startup_settings_opened = True
+        try:
+            with profiler.stage("settings window"):
+                self.open_settings()
+        except Exception as e:
+            print(f"CRITICAL ERROR Opening Settings: {e}")
+            import traceback
+            traceback.print_exc()
+        profiler.mark("settings shown")
+        profiler.publish(default_registry)
+
     def log_message(self, msg):
-        if self.settings_window:
-            self.settings_window.log(msg)
+        # Kept even while the settings window is closed; it backfills on open.
+        self.thread.log_store.append(msg, source="ui")
 
     def set_listening_state(self):
         self.log_message("State: LISTENING")
         self.tray_icon.setIcon(self.create_icon("#007AFF"))
         self.hud.show_listening()
-        # Fast Response: Play pre-generated file
-        self.play_local_sound("yes_sir.aiff")
+        self.thread.hud_shown()
+        # The engine speaks WAKE_RESPONSE from its TTS cache; playing a
+        # second recording here made the two overlap.
 
     def open_settings(self):
         if self.settings_window is None:
-            self.settings_window = SettingsWindow()
+            self.settings_window = SettingsWindow(self.thread.store, self.thread.log_store)
             self.settings_window.log("Console Initialized.")
-            self.settings_window.log(f"Wake Word: {config.DEFAULT_WAKE_WORD}")
+            self.settings_window.log(f"Wake Word: {self.thread.store.snapshot.wake_word}")
             # Connect Mic Toggle
             self.settings_window.mic_btn.toggled.connect(self.toggle_microphone)
             self.settings_window.test_btn.clicked.connect(self.trigger_test_action)
+            self.engine_signals.noise_state.connect(self.settings_window.update_noise_state)
         
         self.settings_window.show()
         self.settings_window.raise_()
@@ -310,10 +444,16 @@ class AudioAutomationApp(QApplication):
     def toggle_microphone(self, enabled):
         if enabled:
             self.thread.resume()
-            self.tray_icon.setIcon(self.create_icon("#007AFF")) # Blue
         else:
             self.thread.pause()
+
+    def on_paused(self, paused):
+        if paused:
             self.tray_icon.setIcon(self.create_icon("#FF3B30")) # Red
+        else:
+            self.tray_icon.setIcon(self.create_icon("#007AFF")) # Blue
+        if self.settings_window:
+            self.settings_window.mic_btn.setChecked(not paused)
 
     def trigger_test_action(self):
         self.log_message("Testing Double Clap Action...")
@@ -323,8 +463,9 @@ class AudioAutomationApp(QApplication):
         self.log_message("State: LISTENING")
         self.tray_icon.setIcon(self.create_icon("#007AFF"))
         self.hud.show_listening()
-        # Fast Response: Play pre-generated file
-        self.play_local_sound("yes_sir.aiff")
+        self.thread.hud_shown()
+        # The engine speaks WAKE_RESPONSE from its TTS cache; playing a
+        # second recording here made the two overlap.
 
     def set_success_state(self):
         self.log_message("State: SUCCESS - Action Triggered")
@@ -340,18 +481,19 @@ class AudioAutomationApp(QApplication):
         except Exception as e:
             print(f"Error speaking: {e}")
 
+    def system_sound_path(self, sound_name):
+        return f"/System/Library/Sounds/{sound_name}.aiff"
+
+    def local_sound_path(self, filename):
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+
     def play_system_sound(self, sound_name):
-        try:
-            subprocess.Popen(["afplay", f"/System/Library/Sounds/{sound_name}.aiff"])
-        except Exception as e:
-            print(f"Error playing sound: {e}")
+        if not self.sounds.play(self.system_sound_path(sound_name)):
+            print(f"Error playing sound: {sound_name}")
 
     def play_local_sound(self, filename):
-        try:
-            # Assumes file is in the current directory
-            subprocess.Popen(["afplay", filename])
-        except Exception as e:
-            print(f"Error playing local sound: {e}")
+        if not self.sounds.play(self.local_sound_path(filename)):
+            print(f"Error playing local sound: {filename}")
 
     def reset_state(self):
         # White for proper visibility on Menu Bar (handles Dark Mode better than Black)
@@ -362,7 +504,8 @@ class AudioAutomationApp(QApplication):
     def open_settings(self):
         if self.settings_window:
             self.settings_window.close()
-        self.settings_window = SettingsWindow()
+        self.settings_window = SettingsWindow(self.thread.store, self.thread.log_store)
+        self.engine_signals.noise_state.connect(self.settings_window.update_noise_state)
         self.settings_window.show()
 
     def toggle_test_hud(self):
@@ -0,0 +1,77 @@
+"""
+Control a running Jarvis (GUI or headless) over its control socket.
+
+Usage:
+    python jarvisctl.py state
+    python jarvisctl.py pause
+    python jarvisctl.py resume
+    python jarvisctl.py trigger 2                 # double-clap action of the wake word
+    python jarvisctl.py trigger 3 --keyword computer
+    python jarvisctl.py metrics [--prometheus]
+    python jarvisctl.py ping --count 1000         # round-trip latency
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import config
+from control import DEFAULT_SOCKET, ControlClient, ControlError
+
+
+def ping(client, count):
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        client.call("ping")
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {
+        "count": count,
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p99_us": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "max_us": timings[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running Jarvis instance.")
+    parser.add_argument("--socket", default=getattr(config, "CONTROL_SOCKET", None) or DEFAULT_SOCKET,
+                        help="Control socket path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("state", help="Show engine status")
+    commands.add_parser("pause", help="Release the microphone")
+    commands.add_parser("resume", help="Reopen the microphone")
+    trigger = commands.add_parser("trigger", help="Fire a clap action")
+    trigger.add_argument("claps", type=int, nargs="?", default=2)
+    trigger.add_argument("--keyword", help="Keyword whose clap table to use (default: the wake word)")
+    metrics = commands.add_parser("metrics", help="Dump metrics")
+    metrics.add_argument("--prometheus", action="store_true", help="Prometheus text instead of JSON")
+    ping_cmd = commands.add_parser("ping", help="Measure round-trip latency")
+    ping_cmd.add_argument("--count", type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        with ControlClient(args.socket) as client:
+            if args.command == "trigger":
+                result = client.call("trigger", args.claps, *([args.keyword] if args.keyword else []))
+            elif args.command == "metrics" and args.prometheus:
+                print(client.call("metrics", "prometheus")["text"], end="")
+                return
+            elif args.command == "ping":
+                result = ping(client, args.count)
+            else:
+                result = client.call(args.command)
+    except OSError as e:
+        print(f"[ERROR] Cannot reach Jarvis on {args.socket}: {e}", file=sys.stderr)
+        sys.exit(2)
+    except ControlError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import collections
+import threading
+import time
+
+import audio_levels
+
+
+def create_porcupine(access_key, keywords):
+    """Build a Porcupine engine for ``keywords`` (imported lazily)."""
+    import pvporcupine
+    return pvporcupine.create(access_key=access_key, keywords=list(keywords))
+
+
+class EngineBuild:
+    """A finished background build: the new engine or the error, and how long it took."""
+
+    def __init__(self, access_key, keywords):
+        self.access_key = access_key
+        self.keywords = tuple(keywords)
+        self.engine = None
+        self.error = None
+        self.requested_at = time.perf_counter()
+        self.build_ms = 0.0
+
+    @property
+    def ok(self):
+        return self.engine is not None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"failed ({self.error})"
+        return f"<EngineBuild {list(self.keywords)} {status} build={self.build_ms:.0f}ms>"
+
+
+class EngineLoader:
+    """
+    Builds replacement keyword engines off the audio thread.
+
+    request() starts a build and returns at once; the audio loop polls
+    take() between frames and swaps the finished engine in, so the old
+    engine keeps listening (and the ring buffer keeps capturing) while the
+    new model loads. A newer request supersedes an older one still in
+    flight; the superseded engine is deleted as soon as it finishes.
+    """
+
+    def __init__(self, factory=create_porcupine):
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._building = False
+        self._ready = None
+
+    @property
+    def pending(self):
+        """True while a requested engine is still loading."""
+        return self._building
+
+    def request(self, access_key, keywords):
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._building = True
+            self._discard(self._ready)
+            self._ready = None
+        build = EngineBuild(access_key, keywords)
+        threading.Thread(target=self._build, args=(generation, build),
+                         name="engine-build", daemon=True).start()
+        return build
+
+    def _build(self, generation, build):
+        started = time.perf_counter()
+        try:
+            build.engine = self.factory(build.access_key, build.keywords)
+        except Exception as e:
+            build.error = str(e) or type(e).__name__
+        build.build_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            if generation != self._generation:
+                # Superseded while loading.
+                self._discard(build)
+                return
+            self._building = False
+            self._ready = build
+
+    def take(self):
+        """The finished build, once (None while nothing is ready)."""
+        with self._lock:
+            build, self._ready = self._ready, None
+            return build
+
+    def cancel(self):
+        """Drop any in-flight or unclaimed build."""
+        with self._lock:
+            self._generation += 1
+            self._building = False
+            self._discard(self._ready)
+            self._ready = None
+
+    @staticmethod
+    def _discard(build):
+        if build is not None and build.engine is not None:
+            build.engine.delete()
+
+
+
+class KeywordGate:
+    """
+    Energy gate in front of a keyword engine (same ``process(pcm)`` interface).
+
+    A frame only reaches the engine when its RMS is at least ``margin_db``
+    above the NoiseFloor estimate, or within ``hangover_seconds`` of such a
+    frame. Skipped frames go into a lookback buffer; when the gate opens,
+    they are replayed into the engine first, so the quiet start of a wake
+    word is not lost and the engine's context is rebuilt.
+
+    stats() reports the fraction of frames skipped and an estimate of the
+    CPU saved: frames never inferred times the mean inference time.
+    """
+
+    def __init__(self, engine, noise_floor, margin_db=6.0, lookback_seconds=0.5,
+                 hangover_seconds=1.0, enabled=True):
+        self.engine = engine
+        self.noise_floor = noise_floor
+        self.margin_db = margin_db
+        self.enabled = enabled
+        frame_seconds = engine.frame_length / engine.sample_rate
+        self.hangover_frames = int(round(hangover_seconds / frame_seconds))
+        self._lookback = collections.deque(maxlen=max(1, int(round(lookback_seconds / frame_seconds))))
+        self._open_frames = 0
+        self.frames = 0
+        self.skipped = 0
+        self.replayed = 0
+        self.inferred = 0
+        self.inference_seconds = 0.0
+        self._next_level = None
+
+    def observe(self, level_rms):
+        """Hand over the RMS of the next frame when the caller has already computed it."""
+        self._next_level = level_rms
+
+    def reset(self):
+        """Forget buffered audio, e.g. after a pause or an engine swap."""
+        self._lookback.clear()
+        self._open_frames = 0
+
+    def _infer(self, pcm):
+        started = time.perf_counter()
+        index = self.engine.process(pcm)
+        self.inference_seconds += time.perf_counter() - started
+        self.inferred += 1
+        return index
+
+    def process(self, pcm):
+        self.frames += 1
+        level_rms, self._next_level = self._next_level, None
+        floor = self.noise_floor.floor_dbfs
+        if self.enabled and floor is not None:
+            if level_rms is None:
+                level_rms = audio_levels.rms(pcm)
+            if audio_levels.dbfs(level_rms) >= floor + self.margin_db:
+                self._open_frames = self.hangover_frames
+            elif self._open_frames > 0:
+                self._open_frames -= 1
+            else:
+                self._lookback.append(pcm)
+                self.skipped += 1
+                return -1
+
+        detected = -1
+        while self._lookback:
+            self.replayed += 1
+            index = self._infer(self._lookback.popleft())
+            if index >= 0 and detected < 0:
+                detected = index
+        index = self._infer(pcm)
+        return detected if detected >= 0 else index
+
+    def stats(self):
+        mean = self.inference_seconds / self.inferred if self.inferred else 0.0
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "replayed": self.replayed,
+            "skip_fraction": (self.skipped - self.replayed) / self.frames if self.frames else 0.0,
+            "cpu_saved_s": (self.skipped - self.replayed) * mean,
+        }
@@ -0,0 +1,406 @@
+import collections
+import threading
+import time
+
+import audio_levels
+import config
+from audio_levels import NoiseFloor
+from audio_sources import PyAudioSource
+from capture import CaptureStream
+from keyword_engine import EngineLoader, KeywordGate
+from metrics import FRAME_BUCKETS
+from pipeline import DetectionPipeline
+
+# Frames of short-term level history used for the signal-to-noise estimate
+# (about one second at 512 samples per frame).
+SNR_HISTORY_FRAMES = 32
+
+
+class DeviceListener:
+    """
+    Capture and detection for one input device, on its own thread.
+
+    Every device has its own capture stream, noise floor, keyword engine,
+    keyword gate and DetectionPipeline; devices share no per-frame state,
+    so CPU cost grows linearly with their number. Pipeline events go to
+    ``on_event(listener, event, value)`` (wake/rearm values are keyword
+    names); ``on_level(listener, level_rms, position)`` sees every frame,
+    ``on_stats(listener, state)`` about once per second of audio and
+    ``on_reset(listener)`` every time the pipeline drops its session
+    (pause or a requested reset).
+
+    Settings snapshots and wake-word engine rebuilds are applied between
+    two frames, as the single-device loop did.
+    """
+
+    def __init__(self, name, engine, keywords, settings, keyword_factory, metrics, log,
+                 on_event, on_level=None, on_stats=None, on_reset=None, source=None, device_index=None):
+        self.name = name
+        self.engine = engine
+        self.keywords = tuple(keywords)
+        self.settings = settings
+        self._applied_settings = settings
+        self.metrics = metrics
+        self.log = log
+        self.on_event = on_event
+        self.on_level = on_level
+        self.on_stats = on_stats
+        self.on_reset = on_reset
+        self.source = source
+        self.device_index = device_index
+        self.capture = None
+        self.reader = None
+        self.is_running = True
+        self.is_paused = False
+        self.snr_db = 0.0
+        self.position = 0
+        self.last_engine_swap = None
+        self._reset_requested = False
+        self._reported_loss = {}
+        self._recent = collections.deque(maxlen=SNR_HISTORY_FRAMES)
+        self._thread = None
+        self.engine_loader = EngineLoader(keyword_factory)
+        self.noise_floor = NoiseFloor(
+            engine.sample_rate,
+            margin_db=settings.auto_threshold_margin_db,
+            min_threshold=getattr(config, "AUTO_THRESHOLD_MIN", 300.0),
+        )
+        # Skip keyword inference on frames well below the noise floor.
+        self.keyword_gate = KeywordGate(
+            engine,
+            self.noise_floor,
+            margin_db=getattr(config, "KEYWORD_GATE_MARGIN_DB", 6.0),
+            lookback_seconds=getattr(config, "KEYWORD_GATE_LOOKBACK_SECONDS", 0.5),
+            enabled=getattr(config, "KEYWORD_GATE", True),
+        )
+        self.pipeline = DetectionPipeline(
+            self.keyword_gate,
+            engine.sample_rate,
+            threshold=settings.clap_threshold,
+            interval=settings.clap_interval,
+            min_gap=settings.clap_min_gap,
+            active_duration=settings.active_duration,
+            wake_during_session=settings.wake_during_session,
+        )
+        m = metrics
+        self.m_frames = m.counter("jarvis_frames_total", "Audio frames processed, by device")
+        self.m_audio_loss = m.counter("jarvis_audio_loss_total",
+                                      "Audio lost, by device and cause (overflows, dropped, read_errors, overruns)")
+        self.m_frame_seconds = m.histogram("jarvis_frame_seconds", "Processing time per audio frame",
+                                           buckets=FRAME_BUCKETS)
+        self.m_cpu = m.counter("jarvis_device_cpu_seconds_total", "Frame processing time, by device")
+        self.m_noise_floor = m.gauge("jarvis_noise_floor_dbfs", "Estimated noise floor, by device")
+        self.m_snr = m.gauge("jarvis_device_snr_db", "Recent peak level above the noise floor, by device")
+        self.m_gate_skip = m.gauge("jarvis_keyword_skip_fraction",
+                                   "Fraction of frames without keyword inference, by device")
+        self.m_gate_saved = m.gauge("jarvis_keyword_cpu_saved_seconds",
+                                    "CPU time saved by the keyword gate, by device")
+
+    def apply_config(self, settings):
+        """Use a new ConfigSnapshot from the next frame on (any thread)."""
+        self.settings = settings
+
+    def request_reset(self):
+        """Drop any open clap session before the next frame (any thread)."""
+        self._reset_requested = True
+
+    def _reset_session(self):
+        self.pipeline.reset()
+        if self.on_reset:
+            self.on_reset(self)
+
+    def decision_delay(self):
+        """Seconds of audio from the last clap onset to the end of the current frame (listener thread)."""
+        onsets = self.pipeline.claps.clap_onsets
+        if not onsets:
+            return 0.0
+        return (self.position - onsets[-1]) / self.engine.sample_rate
+
+    def current_snr_db(self):
+        """Loudest frame of the last second above the noise floor, in dB (listener thread)."""
+        if not self._recent or self.noise_floor.floor_dbfs is None:
+            return 0.0
+        return audio_levels.dbfs(max(self._recent)) - self.noise_floor.floor_dbfs
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name=f"listener-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.is_running = False
+
+    def wait(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+        return not (self._thread and self._thread.is_alive())
+
+    @property
+    def alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def setup_audio_stream(self):
+        if self.capture and self.capture.is_active: return
+        if not self.capture:
+            if self.source is None:
+                self.source = PyAudioSource(
+                    self.engine.sample_rate,
+                    self.engine.frame_length,
+                    device_index=self.device_index,
+                    callback=getattr(config, "CAPTURE_MODE", "callback") == "callback",
+                    queue_blocks=getattr(config, "CAPTURE_QUEUE_BLOCKS", 32),
+                )
+            self.capture = CaptureStream(
+                self.source,
+                buffer_seconds=getattr(config, "RING_BUFFER_SECONDS", 2.0),
+            )
+        try:
+            self.capture.start()
+            self.reader = self.capture.reader()
+        except Exception as e:
+            self.log(f"Mic Error [{self.name}]: {e}", "ERROR")
+
+    def close_audio_stream(self):
+        if self.capture and self.capture.is_active:
+            self.capture.stop()
+
+    @property
+    def source_ended(self):
+        """True once a finite source (file, synthetic) has delivered its last sample."""
+        return bool(self.capture and self.capture.ended and not self.source.realtime)
+
+    @property
+    def mic_active(self):
+        return bool(self.capture and self.capture.is_active)
+
+    def report_audio_loss(self):
+        """Log any growth in the overflow / drop / overrun counters."""
+        stats = self.capture.stats()
+        stats["overruns"] = self.reader.overruns if self.reader else 0
+        grown = {k: v for k, v in stats.items() if v > self._reported_loss.get(k, 0)}
+        for cause, total in grown.items():
+            self.m_audio_loss.inc(total - self._reported_loss.get(cause, 0), device=self.name, cause=cause)
+        if grown:
+            self.log(f"Audio Loss [{self.name}]: " + ", ".join(f"{k}={v}" for k, v in stats.items()), "WARN")
+        self._reported_loss = stats
+
+    def _apply_pending_settings(self):
+        settings = self.settings
+        if settings is self._applied_settings:
+            return
+        previous, self._applied_settings = self._applied_settings, settings
+        self.pipeline.configure(
+            settings.clap_threshold,
+            settings.clap_interval,
+            settings.clap_min_gap,
+            settings.active_duration,
+            settings.wake_during_session,
+        )
+        self.noise_floor.margin_db = settings.auto_threshold_margin_db
+        if settings.wake_word != previous.wake_word or settings.access_key != previous.access_key:
+            # The current engine keeps listening until the new one is loaded.
+            self.engine_loader.request(settings.access_key, keyword_list(settings))
+
+    def _swap_engine_if_ready(self):
+        """Install a finished background engine build between two frames."""
+        build = self.engine_loader.take()
+        if build is None:
+            return
+        if not build.ok:
+            self.log(f"Wake Engine Error [{self.name}]: {build.error} (keeping '{self.keywords[0]}')", "ERROR")
+            return
+        engine = build.engine
+        if (engine.sample_rate, engine.frame_length) != (self.engine.sample_rate, self.engine.frame_length):
+            # The capture stream is sized for the current engine's frames.
+            engine.delete()
+            self.log(f"Wake Engine Error [{self.name}]: new model needs a different audio format", "ERROR")
+            return
+        started = time.perf_counter()
+        old, self.engine = self.engine, engine
+        # Frames still in the gate's lookback are replayed into the new engine.
+        self.keyword_gate.engine = engine
+        self.keywords = build.keywords
+        old.delete()
+        swap_ms = (time.perf_counter() - started) * 1000.0
+        self.last_engine_swap = {
+            "build_ms": build.build_ms,
+            "swap_ms": swap_ms,
+            "total_ms": (time.perf_counter() - build.requested_at) * 1000.0,
+        }
+        self.log(
+            f"Wake Word [{self.name}]: '{build.keywords[0]}' live (load {build.build_ms:.0f} ms, "
+            f"swap {swap_ms:.2f} ms)"
+        )
+
+    def process(self, pcm, position):
+        """Run the frame ending at sample ``position`` through the noise floor, pipeline and callbacks."""
+        started = time.perf_counter()
+        self.position = position
+        self.m_frames.inc(device=self.name)
+        level_rms = audio_levels.rms(pcm)
+        self.noise_floor.update(level_rms, pcm.size)
+        self.keyword_gate.observe(level_rms)
+        self._recent.append(level_rms)
+
+        if position % self.engine.sample_rate < pcm.size:
+            # About once per second of audio.
+            if self.capture:
+                self.report_audio_loss()
+            self.snr_db = self.current_snr_db()
+            state = self.noise_floor.state()
+            state.update(self.keyword_gate.stats())
+            state["snr_db"] = self.snr_db
+            self.m_noise_floor.set(state["floor_dbfs"], device=self.name)
+            self.m_snr.set(self.snr_db, device=self.name)
+            self.m_gate_skip.set(state["skip_fraction"], device=self.name)
+            self.m_gate_saved.set(state["cpu_saved_s"], device=self.name)
+            if self.on_stats:
+                self.on_stats(self, state)
+
+        if self.on_level:
+            self.on_level(self, level_rms, position)
+
+        # Keyword engine and clap recognizer both see every frame.
+        self._apply_pending_settings()
+        self._swap_engine_if_ready()
+        if self._reset_requested:
+            self._reset_requested = False
+            self._reset_session()
+        if self._applied_settings.auto_threshold:
+            self.pipeline.claps.onsets.threshold = self.noise_floor.threshold
+        for event, value in self.pipeline.process(pcm, position - pcm.size):
+            if event in ("wake", "rearm"):
+                value = self.keywords[value]
+            self.on_event(self, event, value)
+        elapsed = time.perf_counter() - started
+        self.m_frame_seconds.observe(elapsed)
+        self.m_cpu.inc(elapsed, device=self.name)
+
+    def run(self):
+        while self.is_running:
+            if self.is_paused:
+                # Privacy: release the device entirely while paused.
+                self.close_audio_stream()
+                self._reset_session()
+                self.keyword_gate.reset()
+                time.sleep(0.5)
+                continue
+            else:
+                # A recording that ran out is not restarted: its reader
+                # drains the buffered audio and the loop ends at EOF below.
+                # One stopped by a pause is reopened like a microphone.
+                finished = self.source_ended
+                if not self.mic_active and not finished:
+                    self.setup_audio_stream()
+                    if not self.mic_active:
+                        time.sleep(0.5)
+                        continue
+
+            try:
+                pcm = self.reader.read(self.engine.frame_length, timeout=0.5)
+                if pcm is None:
+                    if self.reader.closed and self.source_ended:
+                        self.log(f"End of audio source [{self.name}].")
+                        break
+                    continue
+                self.process(pcm, self.reader.position)
+
+            except Exception:
+                 if not self.mic_active:
+                      self.setup_audio_stream()
+
+        self.engine_loader.cancel()
+        self.engine.delete()
+        self.close_audio_stream()
+
+    def state(self):
+        return {
+            "name": self.name,
+            "mic_active": self.mic_active,
+            "session": self.pipeline.state,
+            "snr_db": self.snr_db,
+            "frames": self.m_frames.value(device=self.name),
+        }
+
+
+class DetectionFusion:
+    """
+    Merges the event streams of several DeviceListeners into one.
+
+    The first device to hear the wake word opens the session at once, so
+    fusion adds no latency. If another device hears the same utterance
+    within ``window_seconds`` at a better signal-to-noise ratio, the
+    session moves to that device silently. Only the device owning the
+    session can end it (claps, timeout, cancel); every other device's
+    events are dropped and its pipeline reset, so each sound is acted on
+    once however many microphones heard it.
+
+    Ownership is decided under the fusion lock; ``deliver(listener, event,
+    value)`` and the handover / suppression callbacks run after it is
+    released, on the submitting listener's thread, so a slow handler never
+    stalls the other devices' audio loops.
+    """
+
+    def __init__(self, deliver, window_seconds=0.5, on_handover=None, on_suppressed=None):
+        self.deliver = deliver
+        self.window_seconds = window_seconds
+        self.on_handover = on_handover
+        self.on_suppressed = on_suppressed
+        self.owner = None
+        self._owner_snr = None
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def submit(self, listener, event, value):
+        """Called by each listener on its own thread."""
+        decision = self.decide(listener, event, value)
+        kind = decision[0]
+        if kind == "deliver":
+            self.deliver(listener, decision[1], value)
+        elif kind == "handover":
+            if self.on_handover:
+                self.on_handover(decision[1], listener, decision[2])
+        elif self.on_suppressed:
+            self.on_suppressed(listener, event)
+
+    def decide(self, listener, event, value):
+        """
+        Update ownership for one event and say what to do with it.
+
+        Returns:
+            tuple: ("deliver", event), ("handover", previous_owner, snr_db)
+            or ("suppress",).
+        """
+        with self._lock:
+            if listener is self.owner:
+                if event in ("claps", "timeout", "cancel"):
+                    self.owner = None
+                return ("deliver", event)
+            if event in ("wake", "rearm"):
+                snr = listener.current_snr_db()
+                if self.owner is None:
+                    self.owner, self._owner_snr = listener, snr
+                    self._opened_at = time.perf_counter()
+                    return ("deliver", "wake")
+                if time.perf_counter() - self._opened_at <= self.window_seconds and snr > self._owner_snr:
+                    previous, self.owner, self._owner_snr = self.owner, listener, snr
+                    previous.request_reset()
+                    return ("handover", previous, snr)
+            listener.request_reset()
+            return ("suppress",)
+
+    def release(self, listener):
+        """
+        End ``listener``'s session if it owns one (its pipeline was reset or
+        paused), delivering a "cancel" so the session state follows.
+        """
+        with self._lock:
+            if listener is not self.owner:
+                return
+            self.owner = None
+        self.deliver(listener, "cancel", None)
+
+
+def keyword_list(settings):
+    """The wake word first, then every extra keyword from KEYWORD_ACTIONS."""
+    extra = getattr(config, "KEYWORD_ACTIONS", {})
+    return tuple(dict.fromkeys([settings.wake_word, *extra]))
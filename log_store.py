@@ -0,0 +1,135 @@
+import collections
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+import config
+
+if sys.platform == "darwin":
+    DEFAULT_LOG_FILE = os.path.expanduser("~/Library/Logs/Jarvis/jarvis.log")
+else:
+    DEFAULT_LOG_FILE = os.path.expanduser("~/.cache/jarvis/jarvis.log")
+
+# One structured log entry. ``seq`` increases by one per record.
+LogRecord = collections.namedtuple("LogRecord", "seq time level source message")
+
+
+class LogStore:
+    """
+    Bounded in-memory log with an optional rotating file behind it.
+
+    append() only puts the record on a queue, so the audio thread never
+    waits on a lock, the disk or the UI. A writer thread moves records into
+    a ring of the last ``capacity`` entries and onto disk (rotated at
+    ``max_bytes``, keeping ``backups`` old files). Readers poll since(seq)
+    and get every newer record in one batch, so memory stays flat however
+    long the process runs, and a window opened later can backfill. With
+    ``echo`` set, the writer thread also prints each record (headless mode).
+    """
+
+    def __init__(self, capacity=2000, path=None, max_bytes=1024 * 1024, backups=3, echo=False):
+        self.capacity = capacity
+        self.path = path
+        self.echo = echo
+        self._ring = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._seq = itertools.count(1)
+        self._file = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._file = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes,
+                                                                  backupCount=backups, encoding="utf-8")
+                self._file.setFormatter(logging.Formatter("%(asctime)s %(levelname)-5s %(name)s: %(message)s"))
+            except OSError as e:
+                print(f"[ERROR] Log file unavailable ({path}): {e}")
+        self._writer = threading.Thread(target=self._write_loop, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def append(self, message, level="INFO", source="engine"):
+        """Record a message. Never blocks."""
+        # The writer thread numbers records as it stores them, so seq order
+        # always matches ring order however many threads append at once.
+        self._queue.put((time.time(), level, source, message))
+
+    def since(self, seq=0):
+        """Records newer than ``seq`` still held in memory, oldest first."""
+        with self._lock:
+            if not self._ring or self._ring[-1].seq <= seq:
+                return []
+            newer = []
+            for record in reversed(self._ring):
+                if record.seq <= seq:
+                    break
+                newer.append(record)
+        newer.reverse()
+        return newer
+
+    def flush(self, timeout=1.0):
+        """Wait until everything appended so far has been stored."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            records = [LogRecord(next(self._seq), *item) for item in batch if isinstance(item, tuple)]
+            with self._lock:
+                self._ring.extend(records)
+            if self.echo:
+                for record in records:
+                    print(format_record(record), flush=True)
+            if self._file:
+                for record in records:
+                    self._file.emit(logging.makeLogRecord({
+                        "name": record.source,
+                        "levelname": record.level,
+                        "levelno": logging.getLevelName(record.level),
+                        "msg": record.message,
+                        "created": record.time,
+                        "msecs": (record.time % 1.0) * 1000.0,
+                    }))
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def close(self):
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def format_record(record):
+    """One display line: time, level (when not INFO) and message."""
+    stamp = time.strftime("%H:%M:%S", time.localtime(record.time))
+    level = "" if record.level == "INFO" else f"{record.level}: "
+    return f"{stamp}  {level}{record.message}"
+
+
+_default_store = None
+
+
+def default_log_store():
+    """The process-wide log store, configured from config.py on first use."""
+    global _default_store
+    if _default_store is None:
+        _default_store = LogStore(
+            capacity=getattr(config, "LOG_BUFFER_LINES", 2000),
+            path=getattr(config, "LOG_FILE", None) or DEFAULT_LOG_FILE,
+            max_bytes=getattr(config, "LOG_FILE_BYTES", 1024 * 1024),
+            backups=getattr(config, "LOG_FILE_BACKUPS", 3),
+        )
+    return _default_store
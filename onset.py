@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class OnsetDetector:
+    """
+    Streaming transient detector that reports onsets as sample positions.
+
+    The input is cut into short hops (1 ms at 16 kHz). A hop is an onset when
+    its RMS is above ``threshold`` and at least ``rise_ratio`` times the RMS
+    of the preceding background window, which rejects sustained sounds such
+    as speech or music. The onset is then refined to the first sample in the
+    hop whose amplitude crosses the threshold.
+
+    All timing is in stream samples, so results do not depend on when (or how
+    late) the reading thread got to the data.
+    """
+
+    def __init__(self, sample_rate, threshold, hop=16, rise_ratio=3.0,
+                 background_seconds=0.05, refractory_seconds=0.05):
+        self.sample_rate = sample_rate
+        self.threshold = float(threshold)
+        self.hop = hop
+        self.rise_ratio = rise_ratio
+        self.background_hops = max(1, int(background_seconds * sample_rate / hop))
+        self.refractory = int(refractory_seconds * sample_rate)
+        self.reset()
+
+    def reset(self, position=None):
+        self._next_position = position
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._history = np.zeros(0, dtype=np.float64)
+        self._last_onset = None
+
+    def process(self, samples, position):
+        """
+        Feed a block of int16 samples that starts at stream sample ``position``.
+
+        Returns:
+            list: Sample positions of the onsets found in this block.
+        """
+        if self._next_position != position:
+            # Gap or seek in the stream: history no longer applies.
+            self.reset(position)
+        self._next_position = position + samples.size
+
+        block = np.concatenate((self._remainder, samples)) if self._remainder.size else samples
+        block_start = position - self._remainder.size
+        hops = block.size // self.hop
+        self._remainder = block[hops * self.hop:]
+        if hops == 0:
+            return []
+
+        frames = block[:hops * self.hop].astype(np.float64).reshape(hops, self.hop)
+        energy = np.einsum("ij,ij->i", frames, frames) / self.hop
+
+        # Mean energy of the background window before each hop, via a
+        # running sum over (carried history + this block).
+        k = self.background_hops
+        history = np.concatenate((self._history, energy))
+        csum = np.concatenate(([0.0], np.cumsum(history)))
+        offset = self._history.size
+        idx = np.arange(offset, offset + hops)
+        lo = np.maximum(idx - k, 0)
+        counts = np.maximum(idx - lo, 1)
+        background = (csum[idx] - csum[lo]) / counts
+        # The very first hop after a reset has no background to rise above.
+        background[idx == 0] = np.inf
+        self._history = history[-k:]
+
+        threshold_sq = self.threshold * self.threshold
+        rise_sq = self.rise_ratio * self.rise_ratio
+        candidates = np.flatnonzero((energy > threshold_sq) & (energy > rise_sq * background))
+
+        onsets = []
+        for i in candidates:
+            hop_samples = frames[i]
+            crossing = np.flatnonzero(np.abs(hop_samples) >= self.threshold)
+            onset = int(block_start + i * self.hop + (crossing[0] if crossing.size else 0))
+            if self._last_onset is not None and onset - self._last_onset < self.refractory:
+                continue
+            self._last_onset = onset
+            onsets.append(onset)
+        return onsets
@@ -0,0 +1,131 @@
+from onset import OnsetDetector
+
+# Pipeline states.
+IDLE = "idle"
+ARMED = "armed"
+
+
+class ClapRecognizer:
+    """
+    Streaming clap-pattern recognizer driven by the sample clock.
+
+    The onset detector sees every frame, armed or not, so its background
+    estimate is already settled when a session starts. Onsets only count
+    while a session is open.
+    """
+
+    def __init__(self, sample_rate, threshold, interval, min_gap):
+        self.sample_rate = sample_rate
+        self.onsets = OnsetDetector(sample_rate, threshold)
+        self.interval = int(interval * sample_rate)
+        self.min_gap = int(min_gap * sample_rate)
+        self.clap_onsets = []
+        self._start = None
+        self._deadline = None
+
+    @property
+    def active(self):
+        return self._start is not None
+
+    def configure(self, threshold, interval, min_gap):
+        """Retune between frames; an open session keeps its start and deadline."""
+        self.onsets.threshold = float(threshold)
+        self.interval = int(interval * self.sample_rate)
+        self.min_gap = int(min_gap * self.sample_rate)
+
+    def start(self, position, timeout):
+        """Open a session at stream sample ``position`` lasting ``timeout`` seconds."""
+        self.clap_onsets = []
+        self._start = position
+        self._deadline = position + int(timeout * self.sample_rate)
+
+    def cancel(self):
+        self._start = None
+        self._deadline = None
+
+    def feed(self, samples, position):
+        """
+        Feed one block of samples starting at stream sample ``position``.
+
+        Returns:
+            int | None: The clap count when the session finishes in this block
+            (0 if it timed out with no clap), otherwise None.
+        """
+        onsets = self.onsets.process(samples, position)
+        if not self.active:
+            return None
+        for onset in onsets:
+            if onset < self._start:
+                continue
+            if not self.clap_onsets:
+                if onset < self._deadline:
+                    self.clap_onsets.append(onset)
+            elif onset - self.clap_onsets[0] <= self.interval and onset - self.clap_onsets[-1] >= self.min_gap:
+                self.clap_onsets.append(onset)
+
+        end = position + samples.size
+        if self.clap_onsets:
+            if end - self.clap_onsets[0] >= self.interval:
+                self.cancel()
+                return len(self.clap_onsets)
+        elif end >= self._deadline:
+            self.cancel()
+            return 0
+        return None
+
+
+class DetectionPipeline:
+    """
+    Single-pass state machine running the keyword engine and the clap
+    recognizer on every frame.
+
+    ``process`` returns a list of events for the frame, each a tuple:
+        ("wake", keyword_index)    wake word heard while idle; session armed
+        ("rearm", keyword_index)   wake word heard mid-session; window restarted
+        ("cancel", keyword_index)  wake word heard mid-session; session dropped
+        ("claps", count)           session finished with ``count`` claps
+        ("timeout", 0)             session expired without a clap
+    """
+
+    def __init__(self, keyword_engine, sample_rate, threshold, interval, min_gap,
+                 active_duration, wake_during_session="rearm"):
+        self.keyword_engine = keyword_engine
+        self.claps = ClapRecognizer(sample_rate, threshold, interval, min_gap)
+        self.active_duration = active_duration
+        self.wake_during_session = wake_during_session
+        self.state = IDLE
+
+    def configure(self, threshold, interval, min_gap, active_duration, wake_during_session):
+        """Apply new settings; takes effect from the next processed frame."""
+        self.claps.configure(threshold, interval, min_gap)
+        self.active_duration = active_duration
+        self.wake_during_session = wake_during_session
+
+    def reset(self):
+        """Drop any open session, e.g. when the microphone is paused."""
+        self.claps.cancel()
+        self.state = IDLE
+
+    def process(self, pcm, position):
+        events = []
+        end = position + pcm.size
+
+        keyword_index = self.keyword_engine.process(pcm)
+        if keyword_index >= 0:
+            if self.state == IDLE:
+                self.claps.start(end, self.active_duration)
+                self.state = ARMED
+                events.append(("wake", keyword_index))
+            elif self.wake_during_session == "cancel":
+                self.claps.cancel()
+                self.state = IDLE
+                events.append(("cancel", keyword_index))
+            else:
+                self.claps.start(end, self.active_duration)
+                events.append(("rearm", keyword_index))
+
+        result = self.claps.feed(pcm, position)
+        if result is not None:
+            self.state = IDLE
+            events.append(("claps", result) if result else ("timeout", 0))
+        return events
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Linux truncates /proc/<pid>/comm (and therefore `pgrep -x`) to 15 characters.
+LINUX_COMM_LENGTH = 15
+
+
+def _scan_proc():
+    names = set()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/comm") as f:
+                names.add(f.read().rstrip("\n"))
+        except OSError:
+            # The process exited between listdir and open.
+            continue
+    return names
+
+
+def _scan_ps():
+    # One ps call for the whole table; -c prints executable names, not paths.
+    out = subprocess.run(["ps", "-axco", "comm="], capture_output=True, text=True, check=True).stdout
+    return {line.strip() for line in out.splitlines() if line.strip()}
+
+
+def scan_process_names():
+    """Return the set of names of every running process, in one pass."""
+    if sys.platform.startswith("linux") and os.path.isdir("/proc"):
+        return _scan_proc()
+    return _scan_ps()
+
+
+class ProcessTable:
+    """
+    Snapshot of the process list, shared by all "is X running" queries.
+
+    The table is scanned at most once per ``ttl`` seconds; call invalidate()
+    after launching or closing something so the next query rescans.
+    """
+
+    def __init__(self, ttl=1.0, scanner=scan_process_names):
+        self.ttl = ttl
+        self.scanner = scanner
+        self.scans = 0
+        self._names = frozenset()
+        self._taken_at = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._taken_at = None
+
+    def snapshot(self, max_age=None):
+        """
+        Current process names, rescanning if the cached copy is older than
+        ``max_age`` seconds (default: the table's ttl).
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            now = time.monotonic()
+            if self._taken_at is None or now - self._taken_at > max_age:
+                self._names = frozenset(self.scanner())
+                self._taken_at = now
+                self.scans += 1
+            return self._names
+
+    def running(self, app_names, max_age=None):
+        """
+        Answer "which of these are running" from a single snapshot.
+
+        Returns:
+            dict: app name -> bool.
+        """
+        names = self.snapshot(max_age)
+        truncate = sys.platform.startswith("linux")
+        return {
+            app: app in names or (truncate and app[:LINUX_COMM_LENGTH] in names)
+            for app in app_names
+        }
+
+    def is_running(self, app_name, max_age=None):
+        return self.running([app_name], max_age)[app_name]
+
+
+# Shared instance used by app_launcher.
+default_table = ProcessTable()
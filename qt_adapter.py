@@ -0,0 +1,28 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class QtEngineBridge(QObject):
+    """
+    Re-emits a VoiceLauncher's plain signals as Qt signals.
+
+    The engine emits from its audio thread; because this object lives in the
+    GUI thread, Qt queues each emission and delivers it on the GUI thread,
+    so slots may touch widgets.
+    """
+
+    online = pyqtSignal(bool)
+    paused = pyqtSignal(bool)
+    wake_detected = pyqtSignal()
+    listening_claps = pyqtSignal()
+    success = pyqtSignal()
+    audio_level = pyqtSignal(float)
+    noise_state = pyqtSignal(dict)
+
+    SIGNALS = ("online", "paused", "wake_detected", "listening_claps", "success",
+               "audio_level", "noise_state")
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        for name in self.SIGNALS:
+            getattr(engine, name).connect(getattr(self, name).emit)
@@ -0,0 +1,72 @@
+"""
+Run the clap detector over recorded or synthetic audio, unthrottled.
+
+Usage:
+    python replay.py recording.wav
+    python replay.py room.raw --rate 16000
+    python replay.py --synthetic 60 --claps 10.0,10.5,40.0,40.4,40.8
+"""
+import argparse
+import time
+
+import config
+from audio_sources import FileSource, SourceReader, SyntheticSource
+from voice_launcher import ClapDetector
+
+
+def replay(source, detector=None):
+    """
+    Scan a whole source for clap sessions as fast as it can be read.
+
+    Returns:
+        tuple: (sessions, samples) where sessions is a list of
+        (first_clap_seconds, clap_count, intervals_ms) and samples is the
+        number of samples read.
+    """
+    detector = detector or ClapDetector()
+    sessions = []
+    with source:
+        reader = SourceReader(source)
+        while not reader.closed:
+            # Each call returns after the first clap's sequence window, or
+            # after active_duration seconds of audio with no claps at all.
+            count = detector.listen_for_claps(reader)
+            if count:
+                sessions.append((detector.first_clap_position / source.sample_rate, count,
+                                 detector.clap_intervals_ms()))
+    return sessions, reader.position
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay audio through the clap detector.")
+    parser.add_argument("path", nargs="?", help="WAV or raw int16 PCM file")
+    parser.add_argument("--rate", type=int, default=config.SAMPLE_RATE, help="Sample rate of the input")
+    parser.add_argument("--raw", action="store_true", help="Treat the file as headerless int16 PCM")
+    parser.add_argument("--synthetic", type=float, metavar="SECONDS", help="Generate audio instead of reading a file")
+    parser.add_argument("--claps", default="", help="Comma-separated clap times for --synthetic")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        claps = [float(t) for t in args.claps.split(",") if t]
+        source = SyntheticSource(sample_rate=args.rate, frames_per_buffer=config.CHUNK_SIZE,
+                                 duration=args.synthetic, claps=claps)
+    elif args.path:
+        source = FileSource(args.path, sample_rate=args.rate, frames_per_buffer=config.CHUNK_SIZE,
+                            raw=args.raw or None)
+    else:
+        parser.error("give a file path or --synthetic SECONDS")
+
+    started = time.perf_counter()
+    sessions, samples = replay(source)
+    elapsed = time.perf_counter() - started
+
+    for start, count, intervals in sessions:
+        gaps = ", ".join(f"{ms:.1f}" for ms in intervals)
+        print(f"{start:10.4f}s  {count} claps" + (f"  (gaps ms: {gaps})" if gaps else ""))
+    audio_seconds = samples / args.rate
+    print(f"Processed {audio_seconds:.1f}s of audio in {elapsed:.3f}s "
+          f"({samples / elapsed:,.0f} samples/s, {audio_seconds / elapsed:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-    QComboBox, QSlider, QPushButton, QGroupBox, QMessageBox, QTextEdit, QTabWidget
+    QComboBox, QSlider, QPushButton, QGroupBox, QMessageBox, QTextEdit, QTabWidget,
+    QCheckBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 import config
+from config_store import ConfigError, default_store
+from log_store import default_log_store, format_record
 
 class SettingsWindow(QWidget):
-    def __init__(self):
+    def __init__(self, store=None, log_store=None):
         super().__init__()
+        self.store = store or default_store()
+        self.log_store = log_store or default_log_store()
+        self._log_seq = 0
+        settings = self.store.snapshot
+        # Sensor settings as last saved, restored if the window closes unsaved.
+        self._saved = settings
         self.setWindowTitle("Jarvis Command Center")
         self.setFixedSize(500, 600) # Slightly wider
         self.setStyleSheet("""
@@ -132,13 +141,22 @@ class SettingsWindow(QWidget):
         slider_layout = QHBoxLayout()
         self.threshold_slider = QSlider(Qt.Orientation.Horizontal)
         self.threshold_slider.setRange(100, 5000)
-        self.threshold_slider.setValue(int(config.CLAP_THRESHOLD))
-        self.threshold_label = QLabel(str(config.CLAP_THRESHOLD))
+        self.threshold_slider.setValue(int(settings.clap_threshold))
+        self.threshold_label = QLabel(str(int(settings.clap_threshold)))
         self.threshold_label.setStyleSheet("font-weight: bold; width: 40px;")
-        self.threshold_slider.valueChanged.connect(lambda v: self.threshold_label.setText(str(v)))
+        self.threshold_slider.valueChanged.connect(self.preview_threshold)
         slider_layout.addWidget(self.threshold_slider)
         slider_layout.addWidget(self.threshold_label)
         audio_layout.addLayout(slider_layout)
+
+        self.auto_check = QCheckBox("Auto threshold (follow room noise)")
+        self.auto_check.setChecked(settings.auto_threshold)
+        self.threshold_slider.setEnabled(not settings.auto_threshold)
+        self.auto_check.toggled.connect(self.preview_auto_threshold)
+        audio_layout.addWidget(self.auto_check)
+        self.noise_label = QLabel("Noise floor: measuring...")
+        self.noise_label.setStyleSheet("color: #888; font-size: 11px;")
+        audio_layout.addWidget(self.noise_label)
         audio_group.setLayout(audio_layout)
         dash_layout.addWidget(audio_group)
 
@@ -149,6 +167,8 @@ class SettingsWindow(QWidget):
         self.log_console.setReadOnly(True)
         self.log_console.setStyleSheet("font-family: monospace; font-size: 11px; background-color: #111;")
         self.log_console.setPlaceholderText("Initializing systems...")
+        # Oldest lines drop off, so the console's memory stays bounded.
+        self.log_console.document().setMaximumBlockCount(self.log_store.capacity)
         log_layout.addWidget(self.log_console)
         log_group.setLayout(log_layout)
         dash_layout.addWidget(log_group)
@@ -168,14 +188,14 @@ class SettingsWindow(QWidget):
         self.key_input = QLineEdit()
         self.key_input.setPlaceholderText("Paste Porcupine Key")
         self.key_input.setEchoMode(QLineEdit.EchoMode.Password)
-        self.key_input.setText(config.PORCUPINE_ACCESS_KEY)
+        self.key_input.setText(settings.access_key)
         self.key_input.setToolTip("Your API Key from PicoVoice Console")
         wake_layout.addWidget(self.key_input)
         
         wake_layout.addWidget(QLabel("Wake Word Model:"))
         self.wake_combo = QComboBox()
         self.wake_combo.addItems(config.AVAILABLE_WAKE_WORDS)
-        current_wake = config.DEFAULT_WAKE_WORD.lower()
+        current_wake = settings.wake_word.lower()
         index = self.wake_combo.findText(current_wake)
         if index >= 0: self.wake_combo.setCurrentIndex(index)
         wake_layout.addWidget(self.wake_combo)
@@ -196,11 +216,16 @@ class SettingsWindow(QWidget):
         self.tabs.addTab(self.engine_tab, "Engine Config")
         
         # === Save Button (Global) ===
-        self.save_btn = QPushButton("Save & Reboot Systems")
+        self.save_btn = QPushButton("Save & Apply")
         self.save_btn.setObjectName("PrimaryBtn")
         self.save_btn.clicked.connect(self.save_settings)
         main_layout.addWidget(self.save_btn)
 
+        # Log lines are pulled from the store on a timer, not pushed per message.
+        self.log_timer = QTimer(self)
+        self.log_timer.setInterval(getattr(config, "LOG_FLUSH_MS", 200))
+        self.log_timer.timeout.connect(self.flush_log)
+
     def update_mic_style(self, checked):
         if checked:
             self.mic_btn.setText("Microphone: ON")
@@ -209,31 +234,84 @@ class SettingsWindow(QWidget):
             self.mic_btn.setText("Microphone: OFF")
             self.mic_btn.setStyleSheet("background-color: #FF3B30; color: white; border: none; padding: 10px;")
 
+    def preview_threshold(self, value):
+        """Apply the slider live (from the next audio frame) without saving."""
+        self.threshold_label.setText(str(value))
+        self.store.update(persist=False, clap_threshold=value)
+
+    def preview_auto_threshold(self, enabled):
+        self.threshold_slider.setEnabled(not enabled)
+        self.store.update(persist=False, auto_threshold=enabled)
+
+    def update_noise_state(self, state):
+        """Show the engine's noise-floor estimate (VoiceLauncher.noise_state)."""
+        self.noise_label.setText(
+            (f"Device: {state['device']} (SNR {state['snr_db']:.0f} dB)\n" if "device" in state else "")
+            + f"Noise floor: {state['floor_dbfs']:.0f} dBFS  |  "
+            f"Range: {state['range_db']:.0f} dB  |  "
+            f"Auto threshold: {state['threshold']:.0f}"
+            + (f"\nKeyword inference skipped: {state['skip_fraction']:.0%} "
+               f"(CPU saved {state['cpu_saved_s']:.1f} s)" if "skip_fraction" in state else "")
+        )
+
+    def closeEvent(self, event):
+        current, saved = self.store.snapshot, self._saved
+        if (current.clap_threshold, current.auto_threshold) != (saved.clap_threshold, saved.auto_threshold):
+            self.store.update(persist=False, clap_threshold=saved.clap_threshold,
+                              auto_threshold=saved.auto_threshold)
+            for widget in (self.threshold_slider, self.auto_check):
+                widget.blockSignals(True)
+            self.threshold_slider.setValue(int(saved.clap_threshold))
+            self.threshold_label.setText(str(int(saved.clap_threshold)))
+            self.auto_check.setChecked(saved.auto_threshold)
+            self.threshold_slider.setEnabled(not saved.auto_threshold)
+            for widget in (self.threshold_slider, self.auto_check):
+                widget.blockSignals(False)
+        super().closeEvent(event)
+
     def log(self, message):
-        """Append message to console"""
-        self.log_console.append(message)
+        """Add a UI message to the log store; it shows on the next flush."""
+        self.log_store.append(message, source="ui")
+
+    def flush_log(self):
+        """Append every record logged since the last flush in one batch."""
+        records = self.log_store.since(self._log_seq)
+        if not records:
+            return
+        self._log_seq = records[-1].seq
+        self.log_console.append("\n".join(format_record(r) for r in records))
         # Scroll to bottom
         sb = self.log_console.verticalScrollBar()
         sb.setValue(sb.maximum())
+
+    def showEvent(self, event):
+        # Backfill whatever was logged while the window was closed.
+        self.flush_log()
+        self.log_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.log_timer.stop()
+        super().hideEvent(event)
         
     def save_settings(self):
-        # 1. Update In-Memory Config
-        new_conf = config._config_data.copy()
-        
-        # Update Key
-        new_conf["porcupine_access_key"] = self.key_input.text().strip()
-        
-        # Update Wake Word
-        new_conf["system"]["wake_word"] = self.wake_combo.currentText()
-        
-        # Update Threshold
-        new_conf["audio"]["clap_threshold"] = self.threshold_slider.value()
-        
-        # 2. Save to JSON
-        config.save_config(new_conf)
-        
-        # 3. Reload Module
-        config.reload()
-        
-        QMessageBox.information(self, "Saved", "Settings saved successfully!\nRun './start_gui.sh' again if you changed the Wake Word engine.")
+        previous = self.store.snapshot
+        try:
+            # Validated, written atomically to config.json and pushed to the
+            # running engine.
+            saved = self.store.update(
+                access_key=self.key_input.text().strip(),
+                wake_word=self.wake_combo.currentText(),
+                clap_threshold=self.threshold_slider.value(),
+                auto_threshold=self.auto_check.isChecked(),
+            )
+        except (ConfigError, OSError) as e:
+            QMessageBox.warning(self, "Not Saved", f"Settings were not saved:\n{e}")
+            return
+        self._saved = saved
+
+        if saved.wake_word != previous.wake_word or saved.access_key != previous.access_key:
+            QMessageBox.information(self, "Saved", "Settings saved!\nThe new Wake Word engine loads in the background and takes over when ready.")
+        else:
+            QMessageBox.information(self, "Saved", "Settings saved and applied.")
         self.close()
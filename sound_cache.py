@@ -0,0 +1,250 @@
+import collections
+import os
+import struct
+import subprocess
+import threading
+import time
+import wave
+
+import numpy as np
+
+from audio_sources import ignore_stderr
+
+
+def _ext80_to_float(raw):
+    """Decode the 80-bit IEEE extended float AIFF uses for the sample rate."""
+    exponent, mantissa = struct.unpack(">HQ", raw)
+    sign = -1.0 if exponent & 0x8000 else 1.0
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+def _pcm_to_float(pcm, width, big_endian, unsigned_8bit=False):
+    if width == 1:
+        samples = np.frombuffer(pcm, dtype=np.uint8 if unsigned_8bit else np.int8).astype(np.float32)
+        return (samples - 128.0) / 128.0 if unsigned_8bit else samples / 128.0
+    if width == 3:
+        raw = np.frombuffer(pcm[:len(pcm) - len(pcm) % 3], dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        hi, mid, lo = (raw[:, 0], raw[:, 1], raw[:, 2]) if big_endian else (raw[:, 2], raw[:, 1], raw[:, 0])
+        value = (hi << 16) | (mid << 8) | lo
+        value = np.where(value & 0x800000, value - 0x1000000, value)
+        return value.astype(np.float32) / 8388608.0
+    dtype = {2: "i2", 4: "i4"}[width]
+    samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % width], dtype=(">" if big_endian else "<") + dtype)
+    return samples.astype(np.float32) / float(2 ** (8 * width - 1))
+
+
+def read_aiff(path):
+    """
+    Decode an AIFF / AIFF-C file (uncompressed, 'sowt' or 'fl32').
+
+    Returns:
+        tuple: (float32 array of shape (frames, channels), sample_rate)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"FORM" or data[8:12] not in (b"AIFF", b"AIFC"):
+        raise ValueError(f"{path}: not an AIFF file")
+    channels = bits = rate = None
+    compression = b"NONE"
+    pcm = b""
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = struct.unpack(">I", data[pos + 4:pos + 8])[0]
+        body = data[pos + 8:pos + 8 + size]
+        if chunk_id == b"COMM":
+            channels, _, bits = struct.unpack(">hIh", body[:8])
+            rate = _ext80_to_float(body[8:18])
+            if len(body) >= 22:
+                compression = body[18:22]
+        elif chunk_id == b"SSND":
+            offset = struct.unpack(">I", body[:4])[0]
+            pcm = body[8 + offset:]
+        pos += 8 + size + (size & 1)
+    if channels is None:
+        raise ValueError(f"{path}: missing COMM chunk")
+    if compression in (b"fl32", b"FL32"):
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 4], dtype=">f4").astype(np.float32)
+    elif compression in (b"NONE", b"twos", b"sowt"):
+        samples = _pcm_to_float(pcm, (bits + 7) // 8, big_endian=compression != b"sowt")
+    else:
+        raise ValueError(f"{path}: unsupported AIFF-C compression {compression!r}")
+    return samples[:samples.size - samples.size % channels].reshape(-1, channels), int(rate)
+
+
+def read_wav(path):
+    """Decode a PCM WAV file into (float32 frames x channels, sample_rate)."""
+    with wave.open(path, "rb") as w:
+        channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        pcm = w.readframes(w.getnframes())
+    samples = _pcm_to_float(pcm, width, big_endian=False, unsigned_8bit=True)
+    return samples[:samples.size - samples.size % channels].reshape(-1, channels), rate
+
+
+def decode(path):
+    lower = path.lower()
+    if lower.endswith((".aiff", ".aif", ".aifc")):
+        return read_aiff(path)
+    if lower.endswith(".wav"):
+        return read_wav(path)
+    raise ValueError(f"{path}: unsupported sound format")
+
+
+def conform(frames, rate, target_rate, target_channels):
+    """Resample (linear) and remap channels so a cue can be mixed straight into the stream."""
+    if frames.shape[1] >= target_channels:
+        frames = frames[:, :target_channels]
+    else:
+        frames = np.repeat(frames[:, :1], target_channels, axis=1)
+    if rate != target_rate and frames.shape[0] > 1:
+        n_out = int(round(frames.shape[0] * target_rate / rate))
+        src_t = np.arange(frames.shape[0]) / rate
+        dst_t = np.arange(n_out) / target_rate
+        frames = np.stack([np.interp(dst_t, src_t, frames[:, c]) for c in range(target_channels)], axis=1)
+    return np.ascontiguousarray(frames, dtype=np.float32)
+
+
+class SoundPlayer:
+    """
+    Plays cue sounds from memory through one persistent output stream.
+
+    Cues are decoded once (on preload or first use) into an LRU cache bounded
+    by ``max_cache_bytes``. Playing a cue just adds a voice to the mixer that
+    the PortAudio callback drains, so there is no process spawn or file decode
+    on the trigger path. If no output stream can be opened, play() falls back
+    to spawning afplay.
+
+    Every played cue records its trigger-to-audible latency: the wall time
+    until the callback first mixed it, plus the stream's own time until that
+    buffer reaches the DAC. The last 100 are kept in ``latencies_ms`` and each
+    one is passed to ``on_latency(latency_ms)`` (from the audio callback, so
+    it must be quick).
+    """
+
+    def __init__(self, sample_rate=44100, channels=2, frames_per_buffer=256,
+                 max_cache_bytes=16 * 1024 * 1024, on_latency=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.max_cache_bytes = max_cache_bytes
+        self.on_latency = on_latency
+        self.latencies_ms = collections.deque(maxlen=100)
+        self._cache = collections.OrderedDict()
+        self._cache_bytes = 0
+        self._voices = []
+        self._lock = threading.Lock()
+        self._pa = None
+        self._stream = None
+        self._pyaudio = None
+
+    @property
+    def last_latency_ms(self):
+        return self.latencies_ms[-1] if self.latencies_ms else None
+
+    def start(self):
+        """Open the output stream. Returns False (afplay fallback) on failure."""
+        if self._stream:
+            return True
+        try:
+            import pyaudio
+            self._pyaudio = pyaudio
+            with ignore_stderr():
+                self._pa = pyaudio.PyAudio()
+                self._stream = self._pa.open(
+                    rate=self.sample_rate,
+                    channels=self.channels,
+                    format=pyaudio.paFloat32,
+                    output=True,
+                    frames_per_buffer=self.frames_per_buffer,
+                    stream_callback=self._render,
+                )
+            return True
+        except Exception as e:
+            print(f"[ERROR] Could not open sound output, falling back to afplay: {e}")
+            self.close()
+            return False
+
+    def close(self):
+        with ignore_stderr():
+            if self._stream:
+                try:
+                    self._stream.stop_stream()
+                    self._stream.close()
+                except Exception:
+                    pass
+                self._stream = None
+            if self._pa:
+                self._pa.terminate()
+                self._pa = None
+
+    def load(self, path):
+        """Return the decoded cue for ``path``, decoding and caching it if needed."""
+        with self._lock:
+            if path in self._cache:
+                self._cache.move_to_end(path)
+                return self._cache[path]
+        frames, rate = decode(path)
+        cue = conform(frames, rate, self.sample_rate, self.channels)
+        with self._lock:
+            self._cache[path] = cue
+            self._cache_bytes += cue.nbytes
+            # Evict least recently used cues, but never the one just added.
+            while self._cache_bytes > self.max_cache_bytes and len(self._cache) > 1:
+                _, old = self._cache.popitem(last=False)
+                self._cache_bytes -= old.nbytes
+        return cue
+
+    def preload(self, paths):
+        """Decode every existing file in ``paths`` now, so the first play is instant."""
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    self.load(path)
+                except Exception as e:
+                    print(f"[ERROR] Could not preload sound {path}: {e}")
+
+    def play(self, path):
+        """Start playing ``path``. Returns immediately."""
+        if not path or not os.path.exists(path):
+            return False
+        if self._stream:
+            try:
+                cue = self.load(path)
+            except Exception as e:
+                print(f"[ERROR] Could not decode sound {path}: {e}")
+            else:
+                with self._lock:
+                    # Voice: [samples, position, trigger time]
+                    self._voices.append([cue, 0, time.perf_counter()])
+                return True
+        try:
+            subprocess.Popen(["afplay", path], stderr=subprocess.DEVNULL)
+            return True
+        except Exception:
+            return False
+
+    def _render(self, in_data, frame_count, time_info, status_flags):
+        out = np.zeros((frame_count, self.channels), dtype=np.float32)
+        now = time.perf_counter()
+        started = []
+        with self._lock:
+            voices = self._voices
+            for voice in voices:
+                cue, pos, triggered = voice
+                n = min(frame_count, cue.shape[0] - pos)
+                out[:n] += cue[pos:pos + n]
+                if pos == 0 and triggered is not None:
+                    dac_delay = time_info.get("output_buffer_dac_time", 0.0) - time_info.get("current_time", 0.0)
+                    started.append((now - triggered + max(dac_delay, 0.0)) * 1000.0)
+                voice[1] = pos + n
+                voice[2] = None
+            self._voices = [v for v in voices if v[1] < v[0].shape[0]]
+        for latency_ms in started:
+            self.latencies_ms.append(latency_ms)
+            if self.on_latency:
+                self.on_latency(latency_ms)
+        np.clip(out, -1.0, 1.0, out=out)
+        return (out.tobytes(), self._pyaudio.paContinue)
@@ -0,0 +1,79 @@
+import contextlib
+import threading
+import time
+
+# Reference point for every startup offset: the first import of this module,
+# which gui.py and voice_launcher.py do before anything heavy.
+_ORIGIN = time.perf_counter()
+
+
+class StartupProfiler:
+    """
+    Records how long each startup stage takes and when milestones are hit.
+
+    Stages are timed spans (``with profiler.stage("keyword engine"):``) and
+    may run on any thread; marks are points in time such as "mic live".
+    Both are measured from the module import, so a report reads as a
+    timeline of the launch.
+    """
+
+    def __init__(self, origin=None):
+        self.origin = _ORIGIN if origin is None else origin
+        self._stages = []
+        self._marks = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        """Seconds since the origin."""
+        return time.perf_counter() - self.origin
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self._stages.append((name, started - self.origin, ended - started,
+                                     threading.current_thread().name))
+
+    def mark(self, name):
+        """Record the first time ``name`` is reached (later calls are ignored)."""
+        with self._lock:
+            self._marks.setdefault(name, self.elapsed())
+
+    def report(self):
+        """Stages (start order) and marks, all in milliseconds."""
+        with self._lock:
+            stages = sorted(self._stages, key=lambda s: s[1])
+            marks = sorted(self._marks.items(), key=lambda m: m[1])
+        return {
+            "stages": [
+                {"name": name, "start_ms": start * 1000.0, "ms": duration * 1000.0, "thread": thread}
+                for name, start, duration, thread in stages
+            ],
+            "marks": {name: at * 1000.0 for name, at in marks},
+        }
+
+    def summary(self):
+        """Readable timeline, one stage or mark per line."""
+        report = self.report()
+        rows = [(s["start_ms"], f"{s['start_ms']:8.1f} ms  {s['ms']:7.1f} ms  {s['name']} [{s['thread']}]")
+                for s in report["stages"]]
+        rows += [(at, f"{at:8.1f} ms  {'':>7}     -> {name}") for name, at in report["marks"].items()]
+        return "\n".join(line for _, line in sorted(rows))
+
+    def publish(self, registry):
+        """Export the report as gauges on a metrics.Registry."""
+        stage_gauge = registry.gauge("jarvis_startup_stage_seconds", "Duration of each startup stage")
+        mark_gauge = registry.gauge("jarvis_startup_mark_seconds", "Time from launch to each startup milestone")
+        report = self.report()
+        for stage in report["stages"]:
+            stage_gauge.set(stage["ms"] / 1000.0, stage=stage["name"])
+        for name, at in report["marks"].items():
+            mark_gauge.set(at / 1000.0, mark=name)
+
+
+# Shared profiler for the whole process.
+profiler = StartupProfiler()
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+if sys.platform == "darwin":
+    DEFAULT_CACHE_DIR = os.path.expanduser("~/Library/Caches/Jarvis/tts")
+else:
+    DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/jarvis/tts")
+
+
+def say_available():
+    """True if the macOS `say` command is on PATH."""
+    return shutil.which("say") is not None
+
+
+def say_renderer(text, voice, path):
+    """Render speech to an AIFF file with macOS `say`."""
+    subprocess.run(["say", "-v", voice, "-o", path, text], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class TTSCache:
+    """
+    Pre-rendered speech, one audio file per (text, voice).
+
+    Files are named by a hash of voice and text, so the same phrase is only
+    synthesized once. Named slots ("wake", ...) remember which phrase they
+    currently use: when a slot's text or voice changes, only that slot's old
+    file is removed. The directory is kept under ``max_bytes`` by evicting
+    the least recently used files.
+
+    Background renders that fail are reported to ``on_error(text, error)``
+    (printed when it is not set).
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=32 * 1024 * 1024, renderer=say_renderer,
+                 on_error=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.renderer = renderer
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._slots = self._load_index()
+
+    @staticmethod
+    def key(text, voice):
+        return hashlib.sha256(f"{voice}\0{text}".encode("utf-8")).hexdigest()[:32]
+
+    def path_for(self, text, voice):
+        return os.path.join(self.directory, self.key(text, voice) + ".aiff")
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._slots, f)
+        os.replace(tmp, path)
+
+    def cached(self, text, voice):
+        """Path of the rendered file if it already exists, else None."""
+        path = self.path_for(text, voice)
+        if os.path.exists(path):
+            # Mark as recently used for eviction.
+            os.utime(path)
+            return path
+        return None
+
+    def render(self, text, voice, slot=None):
+        """
+        Return the audio file for (text, voice), synthesizing it if needed.
+
+        Args:
+            text (str): Phrase to speak.
+            voice (str): TTS voice name.
+            slot (str): Optional slot name; a previous phrase held by the same
+                slot is invalidated.
+
+        Returns:
+            str: Path to the rendered audio file.
+        """
+        with self._lock:
+            path = self.cached(text, voice)
+            if path is None:
+                path = self.path_for(text, voice)
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".aiff")
+                os.close(fd)
+                try:
+                    self.renderer(text, voice, tmp)
+                    os.replace(tmp, path)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+            if slot is not None:
+                self._assign(slot, self.key(text, voice))
+            self._evict(keep=path)
+            return path
+
+    def _assign(self, slot, key):
+        old = self._slots.get(slot)
+        if old == key:
+            return
+        self._slots[slot] = key
+        # Drop the slot's previous rendering unless another slot still uses it.
+        if old and old not in self._slots.values():
+            try:
+                os.remove(os.path.join(self.directory, old + ".aiff"))
+            except OSError:
+                pass
+        self._save_index()
+
+    def _evict(self, keep):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".aiff"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        pinned = {os.path.join(self.directory, key + ".aiff") for key in self._slots.values()}
+        pinned.add(keep)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path in pinned:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def warm(self, text, voice, slot=None, on_ready=None):
+        """
+        Render in the background so the first use is already cached.
+
+        ``on_ready(path)`` is called from the background thread once the file
+        exists, e.g. to decode it into a SoundPlayer.
+        """
+        thread = threading.Thread(target=self._warm, args=(text, voice, slot, on_ready),
+                                  name="tts-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm(self, text, voice, slot, on_ready):
+        try:
+            path = self.render(text, voice, slot)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(text, e)
+            else:
+                print(f"[ERROR] Could not pre-render speech '{text}': {e}")
+            return
+        if on_ready:
+            on_ready(path)
@@ -1,271 +1,665 @@
-import struct
+import startup
+import signal
 import time
 import sys
 import subprocess
-import os
-import contextlib
-import pyaudio
-import pvporcupine
+import threading
 import config
-import math
-from PyQt6.QtCore import QThread, pyqtSignal
-
-@contextlib.contextmanager
-def ignore_stderr():
-    devnull = os.open(os.devnull, os.O_WRONLY)
-    old_stderr = os.dup(2)
-    sys.stderr.flush()
-    os.dup2(devnull, 2)
-    os.close(devnull)
-    try:
-        yield
-    finally:
-        os.dup2(old_stderr, 2)
-        os.close(old_stderr)
+import audio_levels
+from audio_sources import find_input_device
+from actions import ActionExecutor
+from audio_levels import LevelMeter
+from events import Signal
+from config_store import default_store
+from control import DEFAULT_SOCKET as DEFAULT_CONTROL_SOCKET, ControlError, ControlServer
+from keyword_engine import create_porcupine
+from listener import DetectionFusion, DeviceListener, keyword_list
+from log_store import default_log_store
+from metrics import JsonDumper, MetricsServer, default_registry
+from pipeline import IDLE, ClapRecognizer
+from sound_cache import SoundPlayer
+from tts_cache import DEFAULT_CACHE_DIR as DEFAULT_TTS_CACHE_DIR, TTSCache, say_available
 
 class ClapDetector:
-    def __init__(self, pyaudio_instance=None):
+    """Blocking clap-pattern listener, used for offline replay."""
+
+    def __init__(self, settings=None):
         self.chunk = config.CHUNK_SIZE
-        self.format = pyaudio.paInt16
-        self.channels = 1
         self.rate = config.SAMPLE_RATE
-        self.p = pyaudio_instance if pyaudio_instance else pyaudio.PyAudio()
+        self.settings = settings or default_store().snapshot
+        self.recognizer = ClapRecognizer(
+            self.rate,
+            self.settings.clap_threshold,
+            self.settings.clap_interval,
+            self.settings.clap_min_gap,
+        )
+
+    def apply_config(self, settings):
+        """Use a new config_store.ConfigSnapshot from the next block on."""
+        self.settings = settings
+        self.recognizer.configure(settings.clap_threshold, settings.clap_interval, settings.clap_min_gap)
+
+    @property
+    def clap_onsets(self):
+        """Sample positions of the claps in the most recent session."""
+        return self.recognizer.clap_onsets
+
+    @property
+    def first_clap_position(self):
+        return self.clap_onsets[0] if self.clap_onsets else None
 
     def get_loudness(self, data):
-        count = len(data) // 2
-        shorts = struct.unpack(f"{count}h", data)
-        sum_squares = 0.0
-        for sample in shorts:
-            sum_squares += sample * sample
-        if count == 0: return 0
-        rms = (sum_squares / count) ** 0.5
-        return rms
-
-    def listen_for_claps(self, timeout=config.ACTIVE_DURATION):
-        if config.DEBUG_MODE:
+        return audio_levels.rms(data)
+
+    def clap_intervals_ms(self):
+        """Gaps between the claps of the last session, in milliseconds."""
+        return [
+            (b - a) * 1000.0 / self.rate
+            for a, b in zip(self.clap_onsets, self.clap_onsets[1:])
+        ]
+
+    def listen_for_claps(self, reader, timeout=None):
+        """
+        Wait for a clap pattern on a capture or replay reader.
+
+        Claps are located by onset detection at sample resolution, and every
+        window (timeout, CLAP_INTERVAL, CLAP_MIN_GAP) is measured on the
+        stream's sample clock, never on wall time.
+
+        Args:
+            reader (capture.RingReader | audio_sources.SourceReader): Sample cursor.
+            timeout (float): Seconds of audio to wait for the first clap
+                (default: the active_duration setting).
+
+        Returns:
+            int: Number of claps heard (0 if none before the timeout).
+        """
+        if timeout is None:
+            timeout = self.settings.active_duration
+        if self.settings.debug_mode:
             print(f"[DEBUG] Listening for claps for {timeout} seconds...")
 
-        try:
-            with ignore_stderr():
-                stream = self.p.open(format=self.format,
-                                     channels=self.channels,
-                                     rate=self.rate,
-                                     input=True,
-                                     frames_per_buffer=self.chunk)
-        except Exception as e:
-            print(f"[ERROR] Could not open audio stream for clap detection: {e}")
-            return 0
-
-        start_time = time.time()
-        try:
-            while (time.time() - start_time) < timeout:
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                except Exception as e:
-                    print(f"[ERROR] Audio read error: {e}")
-                    break
-                loudness = self.get_loudness(data)
-                if loudness > config.CLAP_THRESHOLD:
-                    if config.DEBUG_MODE:
-                        print(f"[DEBUG] First clap detected! (Loudness: {loudness:.2f})")
-                    return self._count_subsequent_claps(stream)
-            return 0
-        finally:
-            with ignore_stderr():
-                stream.stop_stream()
-                stream.close()
-
-    def _count_subsequent_claps(self, stream):
-        clap_count = 1
-        start_time = time.time()
-        last_clap = start_time
-        while (time.time() - start_time) < config.CLAP_INTERVAL:
-            try:
-                data = stream.read(self.chunk, exception_on_overflow=False)
-                if self.get_loudness(data) > config.CLAP_THRESHOLD:
-                    now = time.time()
-                    if (now - last_clap) > 0.15: 
-                        clap_count += 1
-                        last_clap = now
-                        if config.DEBUG_MODE:
-                            print(f"[DEBUG] Subsequent clap: {clap_count}")
-            except Exception:
-                break
-        return clap_count
+        self.recognizer.start(reader.position, timeout)
+        while True:
+            data = reader.read(self.chunk, timeout=1.0)
+            if data is None:
+                if reader.closed:
+                    self.recognizer.cancel()
+                    return len(self.clap_onsets)
+                continue
+            result = self.recognizer.feed(data, reader.position - data.size)
+            if result is not None:
+                if self.settings.debug_mode and result:
+                    print(f"[DEBUG] Claps at samples {self.clap_onsets}")
+                return result
 
     def close(self):
         pass
 
-class VoiceLauncher(QThread):
-    wake_detected = pyqtSignal()      
-    listening_claps = pyqtSignal()    
-    success = pyqtSignal()            
-    audio_level = pyqtSignal(float)   
-    log_signal = pyqtSignal(str)      
-    
-    def __init__(self):
-        super().__init__()
-        self.pa = pyaudio.PyAudio()
-        self.clap_detector = ClapDetector(self.pa)
-        self.porcupine = None
-        self.audio_stream = None
+class VoiceLauncher:
+    """
+    The detection engine. It has no UI dependency: state changes are
+    published through plain events.Signal callbacks, which run on the
+    engine thread. gui.py wraps them with qt_adapter.QtEngineBridge;
+    ``python voice_launcher.py`` runs the engine headless.
+
+    Signals: online(bool), paused(bool), wake_detected(), listening_claps(),
+    success(), audio_level(float), noise_state(dict).
+
+    Construction is cheap; the keyword engine, microphone and output
+    devices are opened by initialize() on the engine thread; online(True)
+    fires once audio is flowing, online(False) if initialization failed.
+
+    Each input device in INPUT_DEVICES gets its own listener.DeviceListener
+    thread; a DetectionFusion merges their events, giving each session to
+    the device that heard the wake word best. The HUD level and noise
+    readout follow that device during a session, and the device with the
+    best signal-to-noise ratio otherwise.
+    """
+
+    def __init__(self, source=None, sound_player=None, store=None, metrics=None, log_store=None,
+                 keyword_factory=create_porcupine):
+        self.wake_detected = Signal("wake_detected")
+        self.listening_claps = Signal("listening_claps")
+        self.success = Signal("success")
+        self.audio_level = Signal("audio_level")
+        self.noise_state = Signal("noise_state")
+        self.online = Signal("online")
+        self.paused = Signal("paused")
+        self._thread = None
+        self.source = source
+        self.profiler = startup.profiler
+        # Log lines go to a bounded store; the UI pulls them in batches.
+        self.log_store = log_store or default_log_store()
+        self.metrics = metrics or default_registry
+        self._setup_metrics()
+        # Live settings: the store pushes new immutable snapshots into
+        # apply_config; the run loop picks them up between frames.
+        self.store = store or default_store()
+        self.settings = self.store.snapshot
+        self._applied_settings = self.settings
+        self.keyword_factory = keyword_factory
+        self.listeners = []
+        self.focus = None
+        self.fusion = DetectionFusion(
+            self._on_fused_event,
+            window_seconds=getattr(config, "FUSION_WINDOW_SECONDS", 0.5),
+            on_handover=self._on_handover,
+            on_suppressed=self._on_suppressed,
+        )
+        self.level_meter = LevelMeter(config.SAMPLE_RATE, getattr(config, "HUD_LEVEL_RATE", 15.0))
+        # Until initialize() opens the output stream, play() falls back to afplay.
+        self._owns_sound_player = sound_player is None
+        if sound_player is None:
+            sound_player = SoundPlayer(max_cache_bytes=getattr(config, "SOUND_CACHE_BYTES", 16 * 1024 * 1024))
+        self.sound_player = sound_player
+        self.sound_player.on_latency = self._on_cue_latency
+        self.tts_cache = None
+        # Checked once: without `say` there is no speech and nothing to cache.
+        self.speech_available = say_available()
+        self.executor = ActionExecutor(
+            workers=getattr(config, "ACTION_WORKERS", 4),
+            on_result=self._on_action_result,
+        )
+        self.metrics_server = None
+        self.metrics_dumper = None
+        self.control_server = None
+        self.last_noise_state = None
+        self.session_keyword = None
         self.is_running = True
         self.is_paused = False
-        
-        if not config.PORCUPINE_ACCESS_KEY:
-             self.log_signal.emit("ERROR: Porcupine Key Missing")
-             sys.exit(1)
+        self.store.subscribe(self.apply_config)
 
-        try:
-            self.porcupine = pvporcupine.create(
-                access_key=config.PORCUPINE_ACCESS_KEY,
-                keywords=[config.DEFAULT_WAKE_WORD]
+    def initialize(self):
+        """
+        Heavy setup, run on the engine thread by run().
+
+        The keyword engine and the microphone come first, so audio is live
+        as early as possible; sound output, the TTS cache and the metrics
+        endpoint follow. Every step is timed on the startup profiler.
+
+        Returns:
+            bool: False when the keyword engine cannot be created.
+        """
+        if self.listeners:
+            return True
+        profiler = self.profiler
+        # Build from the newest snapshot, even if the UI changed it meanwhile.
+        settings = self._applied_settings = self.settings
+        if not settings.access_key:
+            self.log("Porcupine Key Missing", "ERROR")
+            return False
+
+        devices = self.input_devices()
+        keywords = keyword_list(settings)
+        for name, device_index in devices:
+            suffix = f" ({name})" if len(devices) > 1 else ""
+            try:
+                # One engine per device, each listening for every keyword
+                # in a single pass over that device's audio.
+                with profiler.stage("keyword engine" + suffix):
+                    engine = self.keyword_factory(settings.access_key, keywords)
+            except Exception as e:
+                self.log(f"Error initializing Porcupine: {e}", "ERROR")
+                break
+            listener = DeviceListener(
+                name, engine, keywords, settings, self.keyword_factory, self.metrics, self.log,
+                on_event=self.fusion.submit,
+                on_level=self._on_level,
+                on_stats=self._on_stats,
+                on_reset=self.fusion.release,
+                source=self.source if len(devices) == 1 else None,
+                device_index=device_index,
             )
-        except Exception as e:
-            print(f"[ERROR] Error initializing Porcupine: {e}")
-            sys.exit(1)
+            with profiler.stage("microphone" + suffix):
+                listener.setup_audio_stream()
+            self.listeners.append(listener)
+        if len(self.listeners) < len(devices):
+            for listener in self.listeners:
+                listener.close_audio_stream()
+                listener.engine.delete()
+            self.listeners = []
+            return False
+        self.focus = self.listeners[0]
+        if any(listener.mic_active for listener in self.listeners):
+            profiler.mark("mic live")
 
-    def play_sound(self, sound_key):
-        """Plays a system sound asynchronously."""
-        path = config.SOUNDS.get(sound_key)
-        if path and os.path.exists(path):
+        with profiler.stage("sound output"):
+            if self._owns_sound_player:
+                self.sound_player.start()
+            # Decode every cue once now; play_sound then only mixes from memory.
+            self.sound_player.preload(config.SOUNDS.values())
+        with profiler.stage("tts cache"):
+            if not self.speech_available:
+                self.log("Speech: 'say' not found, spoken replies disabled", "WARN")
+            else:
+                try:
+                    self.tts_cache = TTSCache(
+                        getattr(config, "TTS_CACHE_DIR", None) or DEFAULT_TTS_CACHE_DIR,
+                        max_bytes=getattr(config, "TTS_CACHE_BYTES", 32 * 1024 * 1024),
+                        on_error=self._on_speech_error,
+                    )
+                    self.tts_cache.warm(settings.wake_response, settings.tts_voice,
+                                        slot="wake", on_ready=self._preload_speech)
+                except OSError as e:
+                    print(f"[ERROR] TTS cache unavailable: {e}")
+        with profiler.stage("metrics endpoint"):
+            port = getattr(config, "METRICS_PORT", 9464)
+            if port:
+                try:
+                    self.metrics_server = MetricsServer(self.metrics, port).start()
+                except OSError as e:
+                    print(f"[ERROR] Metrics endpoint unavailable on port {port}: {e}")
+            json_path = getattr(config, "METRICS_JSON_PATH", None)
+            if json_path:
+                self.metrics_dumper = JsonDumper(self.metrics, json_path,
+                                                 getattr(config, "METRICS_JSON_INTERVAL", 60.0)).start()
+        with profiler.stage("control socket"):
+            path = getattr(config, "CONTROL_SOCKET", DEFAULT_CONTROL_SOCKET)
+            if path:
+                try:
+                    self.control_server = ControlServer(self.control_commands(), path).start()
+                except OSError as e:
+                    print(f"[ERROR] Control socket unavailable ({path}): {e}")
+        self.store.start_watching()
+        return True
+
+    def apply_config(self, settings):
+        """
+        Receive a new config_store.ConfigSnapshot (from any thread).
+
+        Only the reference is swapped here; the run loop applies it before
+        the next frame, so a frame never sees half-updated settings.
+        """
+        self.settings = settings
+        for listener in self.listeners:
+            listener.apply_config(settings)
+
+    def _apply_pending_settings(self):
+        settings = self.settings
+        if settings is self._applied_settings:
+            return
+        previous, self._applied_settings = self._applied_settings, settings
+        if settings.wake_response != previous.wake_response or settings.tts_voice != previous.tts_voice:
+            if self.tts_cache:
+                self.tts_cache.warm(settings.wake_response, settings.tts_voice,
+                                    slot="wake", on_ready=self._preload_speech)
+        if settings.wake_word != previous.wake_word or settings.access_key != previous.access_key:
+            # Each listener loads its own engine and keeps the current one
+            # listening until the new one is ready.
+            self.log(f"Loading Wake Word '{settings.wake_word}'...")
+
+    def input_devices(self):
+        """
+        (name, PortAudio index) for every configured input device.
+
+        INPUT_DEVICES entries are device indexes or parts of device names;
+        an empty list (or an injected source) means the default device.
+        Devices that cannot be found are logged and skipped.
+        """
+        specs = getattr(config, "INPUT_DEVICES", [])
+        if self.source is not None or not specs:
+            return [("default", None)]
+        devices = []
+        for spec in specs:
             try:
-                subprocess.Popen(["afplay", path], stderr=subprocess.DEVNULL)
-            except Exception:
-                pass
+                index, name = find_input_device(spec)
+            except (OSError, ValueError, ImportError) as e:
+                self.log(f"Mic Error: input device {spec!r}: {e}", "ERROR")
+                continue
+            devices.append((name, index))
+        return devices or [("default", None)]
+
+    @property
+    def porcupine_keywords(self):
+        """Keywords the engines currently listen for, wake word first."""
+        if self.listeners:
+            return self.listeners[0].keywords
+        return keyword_list(self.settings)
+
+    keyword_list = staticmethod(keyword_list)
+
+    def _on_level(self, listener, level_rms, position):
+        if listener is self.focus and self.level_meter.enabled:
+            level = self.level_meter.update(audio_levels.normalized_level(level_rms), position)
+            if level is not None:
+                self.audio_level.emit(level)
+
+    def _on_stats(self, listener, state):
+        if listener is self.focus:
+            if len(self.listeners) > 1:
+                state["device"] = listener.name
+            self.last_noise_state = state
+            self.noise_state.emit(state)
+
+    def _update_focus(self):
+        # The session owner during a session, else the clearest device.
+        focus = self.fusion.owner or max(self.listeners, key=lambda listener: listener.snr_db)
+        if focus is not self.focus:
+            self.focus = focus
+            # Positions differ between devices; restart the display clock.
+            self.level_meter.set_enabled(self.level_meter.enabled)
+
+    def _on_fused_event(self, listener, event, value):
+        if len(self.listeners) > 1 and event == "wake":
+            self.log(f"Device: {listener.name} (SNR {listener.current_snr_db():.0f} dB)")
+        # Delivered on the listener's thread right after the deciding frame.
+        decision_s = listener.decision_delay() if event == "claps" else 0.0
+        self.handle_event(event, value, device=listener.name, decision_s=decision_s)
+
+    def _on_handover(self, previous, listener, snr_db):
+        self.m_handovers.inc()
+        self.log(f"Device: {listener.name} (SNR {snr_db:.0f} dB, was {previous.name})")
+
+    def _on_suppressed(self, listener, event):
+        self.m_suppressed.inc(device=listener.name)
+
+    def log(self, message, level="INFO"):
+        """Record a status line without blocking the audio thread."""
+        self.log_store.append(message, level)
+
+    def _setup_metrics(self):
+        m = self.metrics
+        self.m_frames = m.counter("jarvis_frames_total", "Audio frames processed, by device")
+        self.m_wakes = m.counter("jarvis_wake_detections_total", "Wake word detections, by keyword and device")
+        self.m_sessions = m.counter("jarvis_clap_sessions_total", "Finished clap sessions, by clap count")
+        self.m_actions = m.counter("jarvis_actions_total", "Actions fired, by outcome and source")
+        self.m_wake_to_hud = m.histogram("jarvis_wake_to_hud_seconds", "Wake detection to HUD shown")
+        self.m_clap_to_spawn = m.histogram("jarvis_clap_to_spawn_seconds", "Last clap onset to action spawned")
+        self.m_cue_latency = m.histogram("jarvis_cue_latency_seconds", "Cue sound trigger to audible at the DAC")
+        self.m_handovers = m.counter("jarvis_fusion_handovers_total",
+                                     "Sessions moved to a device that heard the wake word better")
+        self.m_suppressed = m.counter("jarvis_fusion_suppressed_total",
+                                      "Events dropped because another device owned the session, by device")
+        self.wake_detected_at = None
+
+    def _on_cue_latency(self, latency_ms):
+        self.m_cue_latency.observe(latency_ms / 1000.0)
+
+    def hud_shown(self):
+        """Called by the UI once the HUD is up after a wake detection."""
+        if self.wake_detected_at is not None:
+            self.m_wake_to_hud.observe(time.perf_counter() - self.wake_detected_at)
+            self.wake_detected_at = None
+
+    @staticmethod
+    def action_table(keyword):
+        """Clap count -> list of actions for the session opened by ``keyword``."""
+        table = getattr(config, "KEYWORD_ACTIONS", {}).get(keyword)
+        if table is None:
+            table = {2: config.APPS_TO_LAUNCH, 3: [config.SECONDARY_ACTION]}
+        return table
+
+    def play_sound(self, sound_key):
+        """Plays a cue sound asynchronously from the in-memory cache."""
+        self.sound_player.play(config.SOUNDS.get(sound_key))
                 
-    def speak(self, text):
-        """Speaks text using macOS native TTS."""
+    def _preload_speech(self, path):
+        self.sound_player.preload([path])
+
+    def _on_speech_error(self, text, error):
+        self.log(f"Speech Error: could not pre-render '{text}': {error}", "ERROR")
+
+    def speak(self, text, slot=None):
+        """Speaks text using macOS native TTS, replaying a cached rendering when available."""
+        if not self.speech_available:
+            return
+        voice = self.settings.tts_voice
+        path = self.tts_cache.cached(text, voice) if self.tts_cache else None
+        if path and self.sound_player.play(path):
+            return
         try:
             # -v Daniel is the British English voice (Jarvis-like)
-            subprocess.Popen(["say", "-v", "Daniel", text], stderr=subprocess.DEVNULL)
+            subprocess.Popen(["say", "-v", voice, text], stderr=subprocess.DEVNULL)
         except Exception:
             pass
+        if self.tts_cache:
+            # Render it for next time without holding up the audio thread.
+            self.tts_cache.warm(text, voice, slot, on_ready=self._preload_speech)
+
+    def set_level_feed_enabled(self, enabled):
+        """Turn the audio_level feed on or off (off while no HUD is showing)."""
+        self.level_meter.set_enabled(enabled)
 
     def pause(self):
+        if self.is_paused:
+            return
         self.is_paused = True
-        self.log_signal.emit("Microphone: DISCONNECTED")
+        for listener in self.listeners:
+            listener.is_paused = True
+        self.log("Microphone: DISCONNECTED")
+        self.paused.emit(True)
         
     def resume(self):
+        if not self.is_paused:
+            return
         self.is_paused = False
-        self.log_signal.emit("Microphone: CONNECTED")
+        for listener in self.listeners:
+            listener.is_paused = False
+        self.log("Microphone: CONNECTED")
+        self.paused.emit(False)
+
+    def control_commands(self):
+        """Command table served on the control socket (see control.py)."""
+        def pause():
+            self.pause()
+            return self.state()
+
+        def resume():
+            self.resume()
+            return self.state()
+
+        return {
+            "ping": lambda: {},
+            "state": self.state,
+            "pause": pause,
+            "resume": resume,
+            "trigger": self.trigger,
+            "metrics": self.metrics_snapshot,
+        }
+
+    def state(self):
+        """Snapshot of the engine's status, safe to call from any thread."""
+        listeners = list(self.listeners)
+        owner = self.fusion.owner
+        return {
+            "online": bool(listeners) and self.is_running,
+            "paused": self.is_paused,
+            "mic_active": any(listener.mic_active for listener in listeners),
+            "wake_word": self.settings.wake_word,
+            "keywords": list(self.porcupine_keywords),
+            "session": owner.pipeline.state if owner else IDLE,
+            "session_device": owner.name if owner else None,
+            "session_keyword": self.session_keyword,
+            "frames": self.m_frames.total(),
+            "noise": self.last_noise_state,
+            "devices": [listener.state() for listener in listeners],
+        }
+
+    def trigger(self, claps="2", keyword=None):
+        """
+        Fire the action bound to ``claps`` claps, as if a session had ended.
+
+        Args:
+            claps (str): Clap count (2 = APPS_TO_LAUNCH, 3 = SECONDARY_ACTION
+                unless KEYWORD_ACTIONS says otherwise).
+            keyword (str): Keyword whose clap table to use (default: the
+                wake word).
+
+        Returns:
+            dict: The keyword, clap count and number of commands submitted.
+        """
+        keyword = keyword or self.porcupine_keywords[0]
+        if keyword not in self.porcupine_keywords:
+            raise ControlError(f"unknown keyword '{keyword}'")
+        actions = self.action_table(keyword).get(int(claps))
+        if not actions:
+            raise ControlError(f"no action for {claps} claps on '{keyword}'")
+        self.log(f"Remote Trigger: {keyword} x{claps} claps")
+        self.execute_commands(actions, source="control")
+        return {"keyword": keyword, "claps": int(claps), "submitted": len(actions)}
+
+    def metrics_snapshot(self, fmt="json"):
+        if fmt == "prometheus":
+            return {"text": self.metrics.render_prometheus()}
+        if fmt != "json":
+            raise ControlError("format must be 'json' or 'prometheus'")
+        return self.metrics.to_json()
             
-    def setup_audio_stream(self):
-        if self.audio_stream and self.audio_stream.is_active(): return
-        if not self.pa:
-            self.pa = pyaudio.PyAudio()
-            self.clap_detector.p = self.pa
-        try:
-            with ignore_stderr():
-                self.audio_stream = self.pa.open(
-                    rate=self.porcupine.sample_rate,
-                    channels=1,
-                    format=pyaudio.paInt16,
-                    input=True,
-                    frames_per_buffer=self.porcupine.frame_length
-                )
-        except Exception as e:
-            self.log_signal.emit(f"Mic Error: {e}")
+    def _on_action_result(self, result):
+        self.m_actions.inc(result="ok" if result.ok else "error", source=result.source or "manual")
+        if result.source == "claps":
+            # Stream time waiting for the clap interval to close, then queue + spawn.
+            self.m_clap_to_spawn.observe((result.decision_ms + result.queued_ms + result.spawn_ms) / 1000.0)
+        if result.ok:
+            self.log(f"Spawned: {result.label} ({result.spawn_ms:.1f} ms)")
+        else:
+            self.log(f"Exec Error: {result.label}: {result.error}", "ERROR")
 
     def execute_command(self, app_config):
-        cmd = app_config.get("command")
-        args = app_config.get("args", [])
-        msg = app_config.get("type_msg", "Executing command")
-        try:
-            self.log_signal.emit(f"Running: {msg}")
+        self.execute_commands([app_config])
+
+    def execute_commands(self, app_configs, source="manual", decision_ms=0.0):
+        """
+        Hand a batch of commands to the action pool and return immediately.
+
+        ``source`` tags the results: "claps" for a finished clap session,
+        "control" for the control socket, "manual" otherwise (test button);
+        ``decision_ms`` is how long ago the triggering clap was heard.
+        """
+        for app_config in app_configs:
+            msg = app_config.get("type_msg", "Executing command")
+            self.log(f"Running: {msg}")
             print(f"[{msg}]...")
-            full_command = [cmd] + args
-            subprocess.Popen(full_command)
-        except Exception as e:
-            self.log_signal.emit(f"Exec Error: {e}")
+        return self.executor.submit(app_configs, source=source, decision_ms=decision_ms)
 
     def launch_apps(self):
         print(f"Executing Double Clap Action")
-        for app_config in config.APPS_TO_LAUNCH:
-            self.execute_command(app_config)
+        return self.execute_commands(config.APPS_TO_LAUNCH)
 
     def trigger_triple_action(self):
         print("Executing Triple Clap Action")
-        self.execute_command(config.SECONDARY_ACTION)
+        return self.execute_commands([config.SECONDARY_ACTION])
         
+    def start(self):
+        """Run the engine on a background thread."""
+        self._thread = threading.Thread(target=self.run, name="voice-launcher", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Block until the engine thread has finished its cleanup."""
+        if self._thread:
+            self._thread.join(timeout)
+        return not (self._thread and self._thread.is_alive())
+
     def stop(self):
         self.is_running = False
 
-    def run(self):
+    def handle_event(self, event, value, device="default", decision_s=0.0):
+        """
+        React to one fused DetectionPipeline event (wake values are keyword
+        names). ``decision_s`` is the stream time from the last clap to the
+        frame that ended a claps session.
+        """
+        if event in ("wake", "rearm"):
+            # The keyword that opened (or reopened) the session picks the clap table.
+            self.session_keyword = value
+            self.m_wakes.inc(keyword=value, device=device)
+            self.wake_detected_at = time.perf_counter()
+            if event == "wake":
+                self.log(f"Wake Word Detected! ({self.session_keyword})")
+            else:
+                self.log(f"Wake Word: Session Restarted ({self.session_keyword})")
+            self.wake_detected.emit()
+            self.speak(self.settings.wake_response, slot="wake") # Replaced play_sound("wake")
+            self.listening_claps.emit()
+        elif event == "cancel":
+            self.log("Session Cancelled.")
+            self.log("Resuming Watch...")
+        elif event == "claps":
+            self.log(f"Claps Detected: {value}")
+            self.m_sessions.inc(claps=value)
+            actions = self.action_table(self.session_keyword).get(value)
+            if actions:
+                self.play_sound("success")
+                self.log(f"Action: {self.session_keyword} x{value} claps")
+                self.success.emit()
+                self.execute_commands(actions, source="claps", decision_ms=decision_s * 1000.0)
+            else:
+                self.log("Ignored.")
+                self.play_sound("error")
+            self.log("Resuming Watch...")
+        elif event == "timeout":
+            self.m_sessions.inc(claps=0)
+            self.log("Claps Detected: 0")
+            self.log("Ignored.")
+            self.play_sound("error")
+            self.log("Resuming Watch...")
+
+    def _announce_online(self):
         print("==" * 30)
-        self.log_signal.emit(f"System Online. Listening for '{config.DEFAULT_WAKE_WORD}'...")
+        self.log(f"System Online. Listening for '{self.settings.wake_word}'...")
+        profiler = self.profiler
+        profiler.mark("online")
+        profiler.publish(self.metrics)
+        marks = profiler.report()["marks"]
+        self.log("Startup: " + ", ".join(f"{name} at {at:.0f} ms" for name, at in marks.items()))
+        if self.settings.debug_mode:
+            print("[DEBUG] Startup timeline:\n" + profiler.summary())
+        self.online.emit(True)
         self.play_sound("startup")
-        
-        self.setup_audio_stream()
-        
-        while self.is_running:
-            if self.is_paused:
-                if self.audio_stream:
-                    with ignore_stderr():
-                        self.audio_stream.stop_stream()
-                        self.audio_stream.close()
-                    self.audio_stream = None
-                if self.pa:
-                    self.pa.terminate()
-                    self.pa = None
-                time.sleep(0.5)
-                continue
-            else:
-                if not self.audio_stream:
-                    self.setup_audio_stream()
 
+    def run(self):
+        if self.initialize():
+            for listener in self.listeners:
+                # Settings may have changed while the engines were loading.
+                listener.apply_config(self.settings)
+                listener.is_paused = self.is_paused
+                listener.start()
+            self._announce_online()
+        else:
+            self.is_running = False
+            self.online.emit(False)
+
+        # Each device is read and processed on its own listener thread;
+        # this loop only handles what is shared between them.
+        while self.is_running:
             try:
-                try:
-                    pcm_bytes = self.audio_stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-                except Exception:
-                    continue
-                
-                pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm_bytes)
-                rms = math.sqrt(sum(x**2 for x in pcm) / len(pcm))
-                level = min(rms / 5000.0, 1.0)
-                self.audio_level.emit(level)
-                
-                keyword_index = self.porcupine.process(pcm)
-                
-                if keyword_index >= 0:
-                    self.log_signal.emit("Wake Word Detected!")
-                    self.wake_detected.emit()
-                    self.speak(config.WAKE_RESPONSE) # Replaced play_sound("wake")
-                    
-                    if self.audio_stream:
-                        self.audio_stream.stop_stream()
-                        self.audio_stream.close()
-                        self.audio_stream = None
-                    
-                    try:
-                        self.listening_claps.emit()
-                        num_claps = self.clap_detector.listen_for_claps(timeout=config.ACTIVE_DURATION)
-                        self.log_signal.emit(f"Claps Detected: {num_claps}")
-                        
-                        if num_claps == 2:
-                            self.play_sound("success")
-                            self.log_signal.emit("Action: Double Clap")
-                            self.success.emit()
-                            self.launch_apps()
-                        elif num_claps == 3:
-                            self.play_sound("success")
-                            self.log_signal.emit("Action: Triple Clap")
-                            self.success.emit()
-                            self.trigger_triple_action()
-                        else:
-                            self.log_signal.emit("Ignored.")
-                            self.play_sound("error")
-                            
-                    finally:
-                        self.log_signal.emit("Resuming Watch...")
-                        self.setup_audio_stream()
-
-            except Exception:
-                 if not self.audio_stream:
-                      self.setup_audio_stream()
+                time.sleep(0.1)
             except KeyboardInterrupt:
                 break
-                
-        if self.porcupine: self.porcupine.delete()
-        if self.audio_stream: self.audio_stream.close()
-        if self.pa: self.pa.terminate()
+            self._apply_pending_settings()
+            self._update_focus()
+            if not any(listener.alive for listener in self.listeners):
+                # Every source has ended (recordings only).
+                break
+
+        for listener in self.listeners:
+            listener.stop()
+        for listener in self.listeners:
+            listener.wait(2.0)
+        self.store.stop_watching()
+        if self.metrics_server: self.metrics_server.stop()
+        if self.metrics_dumper: self.metrics_dumper.stop()
+        if self.control_server: self.control_server.stop()
+        self.executor.shutdown()
+        self.sound_player.close()
+        self.log_store.flush()
+
+
+def main():
+    """Headless daemon: the engine on the main thread, no UI toolkit loaded."""
+    launcher = VoiceLauncher()
+    launcher.log_store.echo = True
+    if not launcher.initialize():
+        launcher.log_store.close()
+        sys.exit(1)
+    # SIGTERM (launchd, systemd, kill) and Ctrl-C stop the loop; run()
+    # then releases the microphone and engines before returning.
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: launcher.stop())
+    launcher.run()
+
+
+if __name__ == "__main__":
+    main()